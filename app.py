@@ -1,16 +1,20 @@
 import os
 import asyncio
-import time
+import hashlib
+import threading
 
 import streamlit as st
-import google.generativeai as genai
 
 from utils.logger import setup_logger
 from utils.file_manager import folder_to_markdown
+from utils.metadata_cache import MetadataCache
+from utils.repo_list import filter_repos, get_languages, paginate
+from utils.workspace import WorkspaceManager
 
 from modules import ReadmeGenerator
 from modules import RepoDownloader
-from modules.ai_providers import get_ai_provider
+from modules.ai_providers import get_ai_provider, get_router_provider
+from modules.ai_providers.batching import BatchReadmeGenerator
 
 # 페이지 기본 설정 (화면을 넓게 씀)
 st.set_page_config(page_title="GitHub README Generator", layout="wide")
@@ -21,23 +25,47 @@ def get_logger():
     return setup_logger()
     
 @st.cache_resource
-def get_repo_downloader(_logger):
-    return RepoDownloader(logger=_logger)
+def get_metadata_cache(_logger):
+    # 모든 세션이 같은 SQLite 캐시 파일을 공유 (서버 재시작 후에도 유지)
+    return MetadataCache(logger=_logger)
+
+@st.cache_resource
+def get_workspace_manager(_logger):
+    # 모든 세션이 같은 작업 폴더 관리자를 공유 (실행마다 별도 스크래치 폴더 + 용량 제한)
+    # tmpfs는 메모리를 쓰므로 README_WORKSPACE_TMPFS=1일 때만 사용
+    root_dir = os.path.dirname(os.path.abspath(__file__))
+    prefer_tmpfs = os.getenv("README_WORKSPACE_TMPFS") == "1"
+    return WorkspaceManager(os.path.join(root_dir, "downloads"), prefer_tmpfs=prefer_tmpfs, logger=_logger)
+
+@st.cache_resource
+def get_repo_downloader(_logger, _metadata_cache):
+    return RepoDownloader(logger=_logger, metadata_cache=_metadata_cache)
+
+@st.cache_resource
+def get_router_stats(service_provider, key_hash):
+    # 라우터 백엔드 통계 (지연시간, 에러율, 쿨다운)는 rerun 사이에도 유지 ({모델 라벨: 통계}라서 예비 모델 구성을 바꿔도 이어짐)
+    # Provider 인스턴스는 asyncio.run마다 이벤트 루프가 바뀌므로 캐시하지 않고 통계만 공유함
+    return {}
 
 # Creation order: logger -> others...
 logger = get_logger()
-repo_downloader = get_repo_downloader(logger)
+metadata_cache = get_metadata_cache(logger)
+workspace_manager = get_workspace_manager(logger)
+repo_downloader = get_repo_downloader(logger, metadata_cache)
 
 # 세션 상태 초기화 (우측 미리보기 인덱스 관리를 위해 필요)
 if 'preview_index' not in st.session_state:
     st.session_state.preview_index = 0
 
-# Repo and archive_pair
+# Repo 메타데이터와 선택 상태 (선택은 레포 ID 집합으로 관리: 체크/해제가 O(1))
 if 'repos' not in st.session_state:
     st.session_state.repos = []
 
-if 'archive_pairs' not in st.session_state:
-    st.session_state.archive_pairs = []
+if 'selected_repo_ids' not in st.session_state:
+    st.session_state.selected_repo_ids = set()
+
+if 'repo_page' not in st.session_state:
+    st.session_state.repo_page = 1
 
 if 'user_name' not in st.session_state:
     st.session_state.user_name = None
@@ -45,16 +73,40 @@ if 'user_name' not in st.session_state:
 if 'loaded_repos' not in st.session_state:
     st.session_state.loaded_repos = []
 
-if 'download_dir' not in st.session_state:
-    current_file_path = os.path.abspath(__file__)
-    root_dir = os.path.dirname(current_file_path)
-    download_dir = os.path.join(root_dir, "downloads")
-    os.makedirs(download_dir, exist_ok=True)
-    st.session_state.download_dir = download_dir
-    
 if 'results' not in st.session_state:
     st.session_state.results = []
 
+def hash_api_key(api_key):
+    # API 키 자체는 저장하지 않고 해시만 캐시 키로 사용
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+async def run_in_session_thread(fn):
+    """
+    fn을 별도 스레드에서 실행하고 결과를 기다림 (CPU/디스크 작업 중에도 이벤트 루프와 UI가 멈추지 않도록)
+    작업 스레드에서도 이 세션의 session_state(로그 핸들러 등)를 쓸 수 있게 스크립트 컨텍스트를 붙여서 시작함
+    """
+    from streamlit.runtime.scriptrunner import add_script_run_ctx
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(setter, value):
+        if not future.done():
+            setter(value)
+
+    def target():
+        try:
+            result = fn()
+        except BaseException as e:
+            loop.call_soon_threadsafe(settle, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(settle, future.set_result, result)
+
+    thread = threading.Thread(target=target, daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+    return await future
+
 def get_current_repo():
     """현재 인덱스에 해당하는 레포지토리 정보를 반환"""
     if 'results' not in st.session_state or not st.session_state.results:
@@ -65,10 +117,11 @@ def get_current_repo():
 # ==========================================
 # 헬퍼 함수: 사용 가능한 Gemini 모델 가져오기
 # ==========================================
-@st.cache_data(ttl=3600) # 1시간 동안 캐싱 (API 호출 절약)
 def get_available_gemini_models(api_key):
-    """API 키를 이용해 실제 사용 가능한 모델 리스트를 가져옴"""
-    try:
+    """API 키를 이용해 실제 사용 가능한 모델 리스트를 가져옴 (영구 캐시: 1시간 신선, 이후 하루 동안 백그라운드 갱신)"""
+    def fetch():
+        # SDK 로딩이 무거워서 Gemini 모델 목록이 실제로 필요할 때만 import
+        import google.generativeai as genai
         genai.configure(api_key=api_key)
         models = []
         for m in genai.list_models():
@@ -77,6 +130,9 @@ def get_available_gemini_models(api_key):
                 # 'models/gemini-pro' 형태에서 'models/' 제거하고 깔끔하게
                 models.append(m.name.replace("models/", ""))
         return models
+
+    try:
+        return metadata_cache.get_or_fetch("gemini_models", hash_api_key(api_key), fetch, ttl=3600, stale_ttl=24 * 3600)
     except Exception as e:
         # 에러 발생 시(키가 틀렸거나 등) 기본 목록 반환
         return ["gemini-1.5-flash", "gemini-pro", "gemini-1.0-pro"]
@@ -105,6 +161,7 @@ with st.sidebar:
     
     # 3. [NEW] 모델 선택 로직
     selected_model_name = ""
+    fallback_options = []
     
     if service_provider == "Gemini":
         if api_key:
@@ -118,6 +175,7 @@ with st.sidebar:
                 index=0 
             )
             # 1.5-flash가 안되면 여기서 gemini-pro 등을 선택하면 됨!
+            fallback_options = [m for m in gemini_options if m != selected_model_name]
         else:
             # 키가 없으면 그냥 보여주기용 더미
             st.selectbox("사용할 모델", ["API 키를 먼저 입력하세요"], disabled=True)
@@ -128,6 +186,19 @@ with st.sidebar:
             ["gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo"],
             index=0
         )
+        fallback_options = [m for m in ["gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo"] if m != selected_model_name]
+
+    # 4. 예비 모델 (라우터) 설정
+    fallback_models = []
+    use_hedge = False
+    if api_key and selected_model_name:
+        fallback_models = st.multiselect(
+            "예비 모델 (Fallback)",
+            fallback_options,
+            help="선택한 모델이 느리거나 실패하면 예비 모델로 자동 전환합니다."
+        )
+        if fallback_models:
+            use_hedge = st.checkbox("느린 요청 중복 전송 (Hedge)", value=True)
         
     st.info("API Key는 저장되지 않습니다.")
     
@@ -144,33 +215,51 @@ col_left, col_mid, col_right = st.columns([1, 1.5, 2])
 with col_left:
     st.subheader("1. GitHub 설정")
     
+    def load_repos(username, force_refresh=False):
+        """
+        레포 메타데이터를 세션에 채움
+        force_refresh가 아니면 캐시를 사용 (10분 신선, 이후 일주일간은 오래된 값을 먼저 보여주고 백그라운드 갱신)
+        """
+        repos = repo_downloader.get_repo_metadata(username, force_refresh=force_refresh)
+        if not st.session_state.get("include_private"):
+            repos = [repo for repo in repos if not repo["private"]]
+
+        # 아카이브 링크는 다운로드할 레포에 대해서만 나중에 구함
+        st.session_state.user_name = username
+        st.session_state.repos = repos
+        st.session_state.selected_repo_ids = set()
+        st.session_state.repo_page = 1
+
+    def on_repo_source_change():
+        # 유저네임/프라이빗 옵션이 바뀌면 캐시된 목록으로 바로 채움 (GitHub API는 캐시가 없거나 오래됐을 때만 호출)
+        username = st.session_state.get("github_username", "").strip()
+        if not username:
+            return
+        try:
+            load_repos(username)
+        except Exception as e:
+            logger.error(f"레포 목록 불러오기 실패 {username}: {e}")
+
     # 유저네임 입력
-    username = st.text_input("GitHub Username", placeholder="e.g., user-name")
+    username = st.text_input("GitHub Username", placeholder="e.g., user-name", key="github_username", on_change=on_repo_source_change)
     
     # 프라이빗 레포 체크박스
-    include_private = st.checkbox("Private Repo 포함 가져오기")
+    include_private = st.checkbox("Private Repo 포함 가져오기", key="include_private", on_change=on_repo_source_change)
     
     st.write("") # 여백
     
-    # 레포 가져오기 버튼
+    # 레포 가져오기 버튼 (명시적인 새로고침)
     if st.button("유저 레포 가져오기", use_container_width=True):
         if not username:
             st.error("GitHub 유저 네임을 입력해주세요!")
         else:
-            # Initailize user name
-            st.session_state.user_name = username
             # 로딩 시작 (스피너)
             with st.spinner(f"GitHub에서 '{username}'님의 저장소를 찾고 있습니다..."):
-                
-                repos = repo_downloader.get_repos_from_git_hub(username)
-                archive_pairs = repo_downloader.get_archive_links(repos, not include_private)
-                time.sleep(1.5) # (로딩 느낌을 주기 위한 가짜 딜레이)
+                # 사용자가 직접 누른 새로고침이므로 캐시를 건너뛰고 최신 목록을 가져옴 (실패 시에만 캐시값 사용)
+                load_repos(username.strip(), force_refresh=True)
                 
             # 로딩이 끝나면 실행되는 부분
             st.success("레포지토리 목록 갱신 완료!")
-            
-            st.session_state.repos = repos
-            st.session_state.archive_pairs = archive_pairs
 
 # ==========================================
 # 2. 중간: 레포 목록 및 선택
@@ -178,21 +267,80 @@ with col_left:
 with col_mid:
     st.subheader("2. 레포지토리 선택")
     
+    # 한 페이지에 그릴 체크박스 수 (레포가 수천 개여도 보이는 페이지만 렌더링)
+    REPO_PAGE_SIZE = 50
+    PUSHED_OPTIONS = {"전체 기간": None, "최근 30일": 30, "최근 90일": 90, "최근 1년": 365}
+    SIZE_OPTIONS = {"전체 크기": None, "1MB 이하": 1024, "10MB 이하": 10 * 1024, "100MB 이하": 100 * 1024}
+
+    def reset_repo_page():
+        st.session_state.repo_page = 1
+
+    def toggle_repo(repo_id):
+        # 체크박스 콜백: 선택 집합만 갱신 (전체 목록을 다시 훑지 않음)
+        if st.session_state[f"repo_{repo_id}"]:
+            st.session_state.selected_repo_ids.add(repo_id)
+        else:
+            st.session_state.selected_repo_ids.discard(repo_id)
+
+    # 검색 및 필터
+    repo_query = st.text_input("레포 검색", placeholder="이름으로 검색", on_change=reset_repo_page)
+    with st.expander("필터"):
+        filter_languages = st.multiselect("언어", get_languages(st.session_state.repos), on_change=reset_repo_page)
+        filter_col1, filter_col2 = st.columns(2)
+        with filter_col1:
+            pushed_label = st.selectbox("최근 푸시", list(PUSHED_OPTIONS), on_change=reset_repo_page)
+            include_forks = st.checkbox("Fork 포함", value=True, on_change=reset_repo_page)
+        with filter_col2:
+            size_label = st.selectbox("크기", list(SIZE_OPTIONS), on_change=reset_repo_page)
+            include_archived = st.checkbox("Archived 포함", value=True, on_change=reset_repo_page)
+
+    filtered_repos = filter_repos(
+        st.session_state.repos,
+        query=repo_query,
+        languages=filter_languages,
+        pushed_within_days=PUSHED_OPTIONS[pushed_label],
+        max_size_kb=SIZE_OPTIONS[size_label],
+        include_forks=include_forks,
+        include_archived=include_archived
+    )
+    page_repos, page_count, st.session_state.repo_page = paginate(filtered_repos, st.session_state.repo_page, REPO_PAGE_SIZE)
+    
     # 컨테이너를 사용하여 영역 구분
     with st.container(height=400, border=True):
-        st.write("가져온 레포지토리 목록")
+        st.write(f"가져온 레포지토리 목록 ({len(filtered_repos)} / {len(st.session_state.repos)})")
         
-        # 전체 선택/해제 기능 (선택 사항)
-        select_all = st.checkbox("전체 선택")
+        # 전체 선택/해제 기능 (현재 필터 결과 기준)
+        select_col1, select_col2 = st.columns(2)
+        with select_col1:
+            if st.button("필터 결과 전체 선택", use_container_width=True):
+                st.session_state.selected_repo_ids.update(repo["id"] for repo in filtered_repos)
+        with select_col2:
+            if st.button("선택 해제", use_container_width=True):
+                st.session_state.selected_repo_ids.clear()
         
         st.divider()
         
-        # 레포지토리 리스트 출력 (체크박스)
-        selected_repos = []
-        for repo in st.session_state.archive_pairs:
-            is_checked = st.checkbox(f"📁 {repo[0]}", value=select_all)
-            if is_checked:
-                selected_repos.append(repo)
+        # 레포지토리 리스트 출력 (현재 페이지만 체크박스로 렌더링)
+        for repo in page_repos:
+            key = f"repo_{repo['id']}"
+            # 위젯을 만들기 전에 선택 집합과 체크 상태를 맞춰둠 (전체 선택/해제 반영)
+            st.session_state[key] = repo["id"] in st.session_state.selected_repo_ids
+            st.checkbox(f"📁 {repo['name']}", key=key, on_change=toggle_repo, args=(repo["id"],))
+
+    # 페이지 이동
+    page_col1, page_col2, page_col3 = st.columns([1, 2, 1], vertical_alignment="center")
+    with page_col1:
+        if st.button("◀", key="repo_prev", disabled=st.session_state.repo_page <= 1):
+            st.session_state.repo_page -= 1
+            st.rerun()
+    with page_col2:
+        st.caption(f"{st.session_state.repo_page} / {page_count} 페이지 · {len(st.session_state.selected_repo_ids)}개 선택됨")
+    with page_col3:
+        if st.button("▶", key="repo_next", disabled=st.session_state.repo_page >= page_count):
+            st.session_state.repo_page += 1
+            st.rerun()
+
+    selected_repo_ids = st.session_state.selected_repo_ids
     
     st.write("") # 여백
     st.divider() # 구분선 추가
@@ -218,8 +366,51 @@ with col_mid:
         )
         st.caption("💡 입력한 키워드를 중심으로 리드미가 작성됩니다.")
 
+        # 3. 스켈레톤 모드 (큰 레포의 프롬프트 크기 축소)
+        use_skeleton = st.checkbox(
+            "스켈레톤 모드 (함수 본문 생략)",
+            help="README에 필요한 시그니처, docstring, 설정 파일 위주로 패키징해서 프롬프트를 줄입니다."
+        )
+
+        # 4. 중복 파일 제거 (LICENSE 사본, 복사된 설정 파일 등)
+        use_dedup = st.checkbox(
+            "중복 파일 제거",
+            value=True,
+            help="내용이 완전히 같은 파일은 한 번만 포함하고 나머지는 경로로만 표시합니다."
+        )
+        use_near_dedup = st.checkbox(
+            "거의 같은 파일도 제거 (느림)",
+            disabled=not use_dedup,
+            help="조금만 다른 파일(복사 후 일부 수정한 설정 파일 등)까지 찾아서 제거합니다. 파일마다 유사도를 계산하므로 패키징이 느려집니다."
+        ) and use_dedup
+
+        # 5. 작은 레포 묶어서 생성 (요청 수 절약)
+        use_batching = st.checkbox(
+            "작은 레포 묶어서 생성 (Batch)",
+            help="파일이 적은 레포 여러 개를 한 번의 AI 요청으로 묶어서 생성합니다. 분당 요청 수 제한에 걸릴 때 유용합니다."
+        )
+
     st.write("") # 여백
     
+    def build_ai_provider():
+        """
+        예비 모델이 선택되어 있으면 라우터로, 아니면 단일 Provider로 생성
+        환경변수 README_RECORD_PATH가 있으면 응답을 녹화 (load_test.py --mode replay 입력용)
+        """
+        if not fallback_models:
+            ai_provider = get_ai_provider(service_provider, api_key, model_name=selected_model_name)
+        else:
+            model_names = [selected_model_name] + fallback_models
+            backend_configs = [(service_provider, api_key, m) for m in model_names]
+            stats = get_router_stats(service_provider, hash_api_key(api_key))
+            ai_provider = get_router_provider(backend_configs, hedge=use_hedge, stats=stats)
+
+        record_path = os.getenv("README_RECORD_PATH")
+        if record_path:
+            from modules.ai_providers import RecordingProvider
+            ai_provider = RecordingProvider(ai_provider, record_path)
+        return ai_provider
+
     # ---------------------------------------------------------
     # [Mock] 2. AI 생성 Async 함수 (다운로드 로직과 구조 동일)
     # ---------------------------------------------------------
@@ -233,9 +424,15 @@ with col_mid:
             st.error("API 키를 입력해주세요.")
             return []
         
-        ai_provider = get_ai_provider(service_provider, api_key, model_name=selected_model_name)
+        ai_provider = build_ai_provider()
         
         logger.debug(f"🧠 AI Provider: {type(ai_provider).__name__} 사용하여 README 생성 시작")
+
+        if use_batching:
+            # 작은 레포는 묶어서, 큰 레포와 파싱 실패한 레포는 개별 요청으로 생성
+            batch_generator = BatchReadmeGenerator(ai_provider, logger=logger)
+            return await batch_generator.generate_all(repo_names, contents, user_keywords, target_lang)
+
         # 내부 함수: 개별 생성 작업
         async def generate_single(name, content):
             return await ai_provider.generate_readme(name, content, user_keywords, target_lang)
@@ -246,6 +443,9 @@ with col_mid:
             generate_single(name, content) 
             for name, content in zip(repo_names, contents)
         ])
+
+        if hasattr(ai_provider, "get_stats"):
+            logger.debug(f"📊 라우터 통계: {ai_provider.get_stats()}")
         
         return results
 
@@ -259,7 +459,7 @@ with col_mid:
             st.error("API 키를 입력해주세요.")
             return None
 
-        ai_provider = get_ai_provider(service_provider, api_key, model_name=selected_model_name)
+        ai_provider = build_ai_provider()
 
         readme = await ai_provider.generate_readme(repo_name, content, user_keywords, target_lang)
         
@@ -268,27 +468,73 @@ with col_mid:
     # 3. 버튼 클릭 핸들러 (매우 깔끔해짐)
     # ---------------------------------------------------------
     if st.button("다운로드 및 README 생성", type="primary", use_container_width=True):
-        if not selected_repos:
+        if not selected_repo_ids:
             st.warning("레포지토리를 선택해주세요.")
         else:
+            selected_meta = [repo for repo in st.session_state.repos if repo["id"] in selected_repo_ids]
+
+            def get_context_key(repo_meta):
+                """
+                HEAD SHA + 패키징 옵션으로 컨텍스트 캐시 키를 만듦 (SHA를 못 구하면 None → 항상 새로 다운로드)
+                """
+                try:
+                    head_sha = repo_downloader.get_head_sha(repo_meta)
+                except Exception as e:
+                    logger.error(f"HEAD SHA 조회 실패 {repo_meta['full_name']}: {e}")
+                    return None
+                return f"{repo_meta['full_name']}@{head_sha}:skeleton={use_skeleton}:dedup={use_dedup}:near_dedup={use_near_dedup}"
+
+            # HEAD SHA가 그대로인 레포는 이전에 패키징한 컨텍스트를 재사용 (다운로드/압축 해제/패키징 생략)
+            context_keys = {repo["name"]: get_context_key(repo) for repo in selected_meta}
+            cached_contexts = {}
+            for name, key in context_keys.items():
+                content = workspace_manager.load_context(key) if key else None
+                if content is not None:
+                    cached_contexts[name] = content
+            if cached_contexts:
+                logger.debug(f"♻️ 변경 없는 레포 {len(cached_contexts)}개는 캐시된 컨텍스트 사용")
+
+            # 나머지 레포에 대해서만 아카이브 링크를 구함 (공개 레포는 API 호출 없음)
+            selected_repos = repo_downloader.get_archive_links_cached(
+                [repo for repo in selected_meta if repo["name"] not in cached_contexts],
+                only_download_public=False
+            )
+
             # 전체 프로세스를 비동기로 실행하는 메인 함수 정의
             async def run_pipeline():
-                # [Step 1] 다운로드 (Spinner)
-                # -------------------------------------------------
-                with st.spinner(f"📦 {len(selected_repos)}개의 레포지토리 다운로드 중..."):
-                    repo_names, file_paths = await repo_downloader.download_all_repos_async(st.session_state.user_name, selected_repos, st.session_state.download_dir)
-                    
-                
-                # Folder to one mark down file
-                with st.status("📦 폴더를 하나의 마크다운 파일로 패키징 중입니다...", expanded=True) as status:
+                # 이번 실행 전용 스크래치 폴더 (실패하면 부분 다운로드까지 통째로 삭제됨)
+                async with workspace_manager.run(st.session_state.user_name) as run_dir:
+                    # [Step 1] 다운로드 (Spinner)
+                    # -------------------------------------------------
+                    repo_names, file_paths = [], []
+                    if selected_repos:
+                        with st.spinner(f"📦 {len(selected_repos)}개의 레포지토리 다운로드 중..."):
+                            repo_names, file_paths = await repo_downloader.download_all_repos_async(st.session_state.user_name, selected_repos, run_dir)
+                        
                     
-                    mk_dir = os.path.join(st.session_state.download_dir, st.session_state.user_name)
-                    contents = []
-                    for repo_name, file_path in zip(repo_names, file_paths):
-                        output_path = os.path.join(mk_dir, f"{repo_name}.md")
-                        contents.append(folder_to_markdown(file_path, output_path, logger))
+                    # Folder to one mark down file
+                    with st.status("📦 폴더를 하나의 마크다운 파일로 패키징 중입니다...", expanded=True) as status:
+                        
+                        mk_dir = os.path.join(run_dir, st.session_state.user_name)
+
+                        def package_repos():
+                            packaged = {}
+                            for repo_name, file_path in zip(repo_names, file_paths):
+                                output_path = os.path.join(mk_dir, f"{repo_name}.md")
+                                packaged[repo_name] = folder_to_markdown(file_path, output_path, logger, skeleton=use_skeleton,
+                                                                           dedup=use_dedup, near_dedup=use_near_dedup)
+                                if context_keys.get(repo_name):
+                                    workspace_manager.store_context(context_keys[repo_name], packaged[repo_name])
+                            return packaged
+
+                        # 패키징은 CPU/디스크 작업이라 별도 스레드에서 실행
+                        packaged = await run_in_session_thread(package_repos)
                         
                     
+                # 선택 순서대로 새로 패키징한 것과 캐시된 것을 합침 (다운로드 실패한 레포는 제외)
+                repo_names = [repo["name"] for repo in selected_meta if repo["name"] in packaged or repo["name"] in cached_contexts]
+                contents = [packaged[name] if name in packaged else cached_contexts[name] for name in repo_names]
+                
                 
                 st.toast("다운로드 및 패키징 완료! AI 생성을 시작합니다.", icon="✅")
                 
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+# 콜드 스타트 시간을 추적할 모듈 (app.py는 import 시 UI를 그리므로 대신 앱이 쓰는 모듈들을 측정)
+DEFAULT_TARGETS = [
+    "utils",
+    "modules",
+    "modules.repo_downloader",
+    "modules.ai_providers",
+    "modules.ai_providers.batching",
+]
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def measure_import(module_name, repeat):
+    """
+    새 파이썬 프로세스에서 모듈을 import하는 시간(ms)을 repeat번 측정
+    인터프리터 자체 기동 시간을 빼기 위해 빈 프로세스 시간도 함께 잼
+    """
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, check=True)
+        return (time.perf_counter() - start) * 1000
+
+    baseline = statistics.median(run("pass") for _ in range(repeat))
+    samples = [run(f"import {module_name}") for _ in range(repeat)]
+    return max(0.0, statistics.median(samples) - baseline)
+
+def top_imports(module_name, limit):
+    """
+    python -X importtime 출력에서 누적 시간이 큰 모듈 상위 N개
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        # 형식: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모듈 import(콜드 스타트) 시간 측정")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="모듈별로 가장 느린 import N개 출력")
+    parser.add_argument("--max-ms", type=float, default=None, help="이 시간을 넘는 모듈이 있으면 종료 코드 1 (CI용)")
+    args = parser.parse_args()
+
+    failed = False
+    for target in args.targets:
+        elapsed = measure_import(target, args.repeat)
+        print(f"{target:<40} {elapsed:8.1f} ms")
+        for cumulative, name in top_imports(target, args.top):
+            print(f"    {name:<36} {cumulative / 1000:8.1f} ms")
+
+        if args.max_ms is not None and elapsed > args.max_ms:
+            failed = True
+
+    sys.exit(1 if failed else 0)
\ No newline at end of file
@@ -0,0 +1,105 @@
+import os
+import time
+import asyncio
+import argparse
+
+from utils.logger import setup_logger
+
+from modules.ai_providers import get_ai_provider
+from modules.ai_providers.base import is_error_response
+from modules.ai_providers.batching import BatchReadmeGenerator
+from modules.ai_providers.fake import load_recorded_requests
+
+def make_fake_context(index, context_kb):
+    """부하 테스트용 가짜 코드 컨텍스트 생성 (folder_to_markdown 출력과 비슷한 모양)"""
+    body = ("def handler():\n    return 42\n" * 64)[: context_kb * 1024]
+    return f"# Project Context: repo-{index}\n\n## 2. File Contents\n\n### File: `main.py`\n```py\n{body}\n```\n"
+
+def make_requests(repo_count, context_kb, keywords="", language="Korean"):
+    """[(repo_name, code_context, keywords, language), ...] 형태의 가짜 요청 목록"""
+    return [(f"repo-{i}", make_fake_context(i, context_kb), keywords, language) for i in range(repo_count)]
+
+async def run_load_test(ai_provider, requests, batch=False):
+    """app.py의 generate_all_readmes_async와 동일하게 gather로 한 번에 생성 요청"""
+    latencies = []
+
+    if batch:
+        names = [name for name, _, _, _ in requests]
+        contents = [content for _, content, _, _ in requests]
+        # 배치 모드는 앱과 같이 모든 레포에 같은 키워드/언어를 사용
+        _, _, keywords, language = requests[0]
+        start = time.monotonic()
+        results = await BatchReadmeGenerator(ai_provider).generate_all(names, contents, keywords, language)
+        elapsed = time.monotonic() - start
+        # 배치 모드는 레포별 지연시간을 따로 잴 수 없으므로 전체 시간만 기록
+        return results, [elapsed], elapsed
+
+    async def generate_single(name, content, keywords, language):
+        start = time.monotonic()
+        readme = await ai_provider.generate_readme(name, content, keywords, language)
+        latencies.append(time.monotonic() - start)
+        return readme
+
+    start = time.monotonic()
+    results = await asyncio.gather(*[generate_single(*request) for request in requests])
+    elapsed = time.monotonic() - start
+
+    return results, latencies, elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API 호출 없이 README 생성 파이프라인 부하 테스트")
+    parser.add_argument("--mode", choices=["fake", "replay", "record"], default="fake",
+                        help="record: 실제 Provider(--backend)로 요청하면서 --record-path에 녹화, replay: 녹화된 요청/응답으로 재생")
+    parser.add_argument("--backend", default="gemini", help="record 모드에서 호출할 실제 Provider")
+    parser.add_argument("--model", default=None, help="record 모드에서 사용할 모델")
+    parser.add_argument("--api-key", default=None, help="record 모드용 API 키 (기본값: 환경변수 <BACKEND>_API_KEY)")
+    parser.add_argument("--repos", type=int, default=100)
+    parser.add_argument("--context-kb", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-mean", type=float, default=1.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--error-429", type=float, default=0.0)
+    parser.add_argument("--error-5xx", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--record-path", default=None)
+    parser.add_argument("--batch", action="store_true", help="작은 레포를 묶어서 요청")
+    args = parser.parse_args()
+
+    logger = setup_logger()
+
+    if args.mode != "fake" and not args.record_path:
+        parser.error(f"--mode {args.mode}에는 --record-path가 필요합니다.")
+
+    requests = make_requests(args.repos, args.context_kb)
+
+    if args.mode == "record":
+        # 실제 API를 호출하므로 요청 수를 작게 잡는 것을 권장
+        api_key = args.api_key or os.getenv(f"{args.backend.upper()}_API_KEY", "")
+        ai_provider = get_ai_provider("record", api_key, model_name=args.model, backend=args.backend, record_path=args.record_path)
+    else:
+        ai_provider = get_ai_provider(
+            args.mode, api_key="", seed=args.seed,
+            latency=args.latency, latency_mean=args.latency_mean, latency_sigma=args.latency_sigma,
+            tokens_per_second=args.tokens_per_second,
+            error_rate_429=args.error_429, error_rate_5xx=args.error_5xx,
+            record_path=args.record_path, max_concurrency=args.concurrency
+        )
+
+    if args.mode == "replay":
+        # 녹화 당시의 실제 프롬프트를 다시 보냄 (--repos가 더 크면 반복해서 채움)
+        recorded = load_recorded_requests(args.record_path)
+        if not recorded:
+            parser.error(f"{args.record_path}에 녹화된 generate_readme 요청이 없습니다.")
+        requests = [recorded[i % len(recorded)] for i in range(args.repos)]
+
+    results, latencies, elapsed = asyncio.run(run_load_test(ai_provider, requests, batch=args.batch))
+
+    errors = sum(1 for r in results if is_error_response(r))
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] if ordered else 0.0
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+
+    logger.debug(f"Total {len(results)} readmes, {errors} errors, {elapsed:.2f}s elapsed")
+    logger.debug(f"Throughput {len(results) / elapsed if elapsed else 0.0:.2f} repo/s, p50 {p50:.2f}s, p95 {p95:.2f}s")
\ No newline at end of file
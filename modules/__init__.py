@@ -1,2 +1,13 @@
-from .readme_generator import ReadmeGenerator
-from .repo_downloader import RepoDownloader
\ No newline at end of file
+import importlib
+
+# 하위 모듈은 실제로 사용할 때 로딩 (modules.ai_providers만 쓰는 경우 GitHub 관련 모듈을 불러오지 않음)
+_LAZY_EXPORTS = {
+    "ReadmeGenerator": ".readme_generator",
+    "RepoDownloader": ".repo_downloader",
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
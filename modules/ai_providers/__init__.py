@@ -1,20 +1,90 @@
-from .gemini import GeminiProvider
-from .openai import OpenAIProvider
+import importlib
 
-def get_ai_provider(provider_name: str, api_key: str, model_name: str = None):
+# Provider 레지스트리: 이름 -> 팩토리 함수 (api_key, model_name, **options) -> Provider
+# SDK(google.generativeai, openai 등)는 팩토리 안에서 import하므로 실제로 선택될 때만 로딩됨
+PROVIDER_REGISTRY = {}
+
+# 하위 호환용: "from modules.ai_providers import GeminiProvider" 같은 import를 지연 로딩으로 처리
+_LAZY_EXPORTS = {
+    "GeminiProvider": ".gemini",
+    "OpenAIProvider": ".openai",
+    "RouterProvider": ".router",
+    "FakeProvider": ".fake",
+    "RecordingProvider": ".fake",
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def register_provider(*names):
+    """
+    데코레이터: 팩토리 함수를 하나 이상의 이름으로 레지스트리에 등록
+    외부 플러그인도 이 데코레이터로 새 Provider를 추가할 수 있음
+    """
+    def decorator(factory):
+        for name in names:
+            PROVIDER_REGISTRY[name.lower()] = factory
+        return factory
+    return decorator
+
+@register_provider("gemini")
+def _create_gemini(api_key, model_name=None, **options):
+    from .gemini import GeminiProvider
+    return GeminiProvider(api_key, model_name=model_name if model_name else "gemini-1.5-flash")
+
+@register_provider("openai")
+def _create_openai(api_key, model_name=None, **options):
+    from .openai import OpenAIProvider
+    return OpenAIProvider(api_key, model_name=model_name if model_name else "gpt-4o-mini")
+
+@register_provider("fake")
+def _create_fake(api_key, model_name=None, **options):
+    # 오프라인 부하 테스트용 (api_key, model_name은 사용하지 않음)
+    from .fake import FakeProvider
+    return FakeProvider(mode="fake", **options)
+
+@register_provider("replay")
+def _create_replay(api_key, model_name=None, **options):
+    from .fake import FakeProvider
+    return FakeProvider(mode="replay", **options)
+
+@register_provider("record")
+def _create_record(api_key, model_name=None, backend="gemini", record_path=None, **options):
+    # 실제 Provider(backend)를 감싸서 응답을 녹화 (replay 모드의 입력 생성용)
+    from .fake import RecordingProvider
+    if not record_path:
+        raise ValueError("record Provider에는 record_path가 필요합니다.")
+    return RecordingProvider(get_ai_provider(backend, api_key, model_name=model_name), record_path)
+
+def get_ai_provider(provider_name: str, api_key: str, model_name: str = None, **options):
     """
     팩토리 함수: 이름에 따라 적절한 AI 인스턴스를 반환
+    options는 fake/replay/record Provider 설정(지연시간, 에러율, 녹화 파일 경로, 녹화할 backend 등)에만 사용됨
     """
     provider_name = provider_name.lower()
-    
-    if provider_name == "gemini":
-        target_model = model_name if model_name else "gemini-1.5-flash"
-        return GeminiProvider(api_key, model_name=target_model)
-    
-    elif provider_name == "openai":
-        target_model = model_name if model_name else "gpt-4o-mini"
-        return OpenAIProvider(api_key, model_name=target_model)
-    
-    else:
+
+    factory = PROVIDER_REGISTRY.get(provider_name)
+    if factory is None:
         print( f"Unsupported provider: {provider_name}" )
-        raise ValueError(f"지원하지 않는 AI Provider입니다: {provider_name}")
\ No newline at end of file
+        raise ValueError(f"지원하지 않는 AI Provider입니다: {provider_name}")
+
+    return factory(api_key, model_name=model_name, **options)
+
+def get_router_provider(backend_configs: list, hedge: bool = True, stats: dict = None):
+    """
+    팩토리 함수: 여러 (provider_name, api_key, model_name) 설정을 묶어 라우터 인스턴스를 반환
+    리스트의 앞쪽 설정일수록 초기 우선순위가 높음
+    stats에 같은 딕셔너리를 계속 넘기면 백엔드 통계가 라우터 재생성 사이에도 유지됨
+    """
+    from .router import RouterProvider
+
+    backends = []
+    for provider_name, api_key, model_name in backend_configs:
+        provider = get_ai_provider(provider_name, api_key, model_name=model_name)
+        label = f"{provider_name}:{model_name}" if model_name else provider_name
+        backends.append((label, provider))
+
+    return RouterProvider(backends, hedge=hedge, stats=stats)
\ No newline at end of file
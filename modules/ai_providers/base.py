@@ -1,13 +1,65 @@
+import time
+import contextvars
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+
+# Provider들은 실패 시 예외 대신 "Error (Gemini): ..." 형태의 문자열을 반환함
+ERROR_PREFIX = "Error ("
+
+# 라우터가 지연시간을 잴 때 세마포어 대기 시간을 빼기 위해, 실제 API 호출이 시작된 시각을 기록하는 곳
+_call_timer = contextvars.ContextVar("call_timer", default=None)
+
+def start_call_timer(timer: dict) -> dict:
+    """
+    현재 태스크에서 일어나는 Provider 호출의 시작 시각을 받을 딕셔너리를 등록
+    Provider가 call_slot()에 들어가면 timer["started"]에 time.monotonic() 값이 기록됨
+    """
+    _call_timer.set(timer)
+    return timer
+
+def is_error_response(text) -> bool:
+    """
+    Provider가 반환한 문자열이 에러 메시지인지 확인
+    """
+    return not text or str(text).startswith(ERROR_PREFIX)
 
 class BaseAIProvider(ABC):
     """
     모든 AI Provider가 상속받아야 하는 추상 클래스
     """
-    
+    # 동시 요청 수를 제한할 Provider는 asyncio.Semaphore를 지정
+    semaphore = None
+
+    @asynccontextmanager
+    async def call_slot(self):
+        """
+        동시 요청 제한(세마포어)을 잡은 뒤 실제 API 호출 구간을 표시
+        세마포어 대기 시간은 라우터의 지연시간 통계와 hedge 타이머에서 제외됨
+        """
+        if self.semaphore is None:
+            self._mark_call_started()
+            yield
+            return
+        async with self.semaphore:
+            self._mark_call_started()
+            yield
+
+    @staticmethod
+    def _mark_call_started():
+        timer = _call_timer.get()
+        if timer is not None:
+            timer["started"] = time.monotonic()
+
     @abstractmethod
     async def generate_readme(self, repo_name: str, code_context: str) -> str:
         """
         레포 이름과 코드 내용을 받아 README 문자열을 반환해야 함.
         """
+        pass
+
+    @abstractmethod
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        """
+        임의의 프롬프트로 텍스트를 생성해서 반환해야 함 (여러 레포를 묶는 배치 생성 등에서 사용)
+        """
         pass
\ No newline at end of file
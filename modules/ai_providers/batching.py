@@ -0,0 +1,159 @@
+import re
+import asyncio
+import logging
+
+from utils.file_manager import estimate_tokens
+
+from .base import BaseAIProvider, is_error_response
+
+# 배치 프롬프트 안에서 각 레포를 구분하는 마커와 응답 섹션 마커
+REPO_MARKER = "<<<REPO {repo_id}: {repo_name}>>>"
+README_START = "<<<README {repo_id}>>>"
+README_END = "<<<END README>>>"
+REPO_MARKER_PATTERN = re.compile(r"<<<REPO (R\d+): (.+?)>>>")
+README_SECTION_PATTERN = re.compile(r"<<<README (R\d+)>>>\s*\n(.*?)\n?\s*<<<END README>>>", re.S)
+# 모델이 섹션 전체를 ```markdown ... ``` 로 감싸서 보내는 경우 (미리보기에서 코드 블록으로 보이게 됨)
+OUTER_FENCE_PATTERN = re.compile(r"\A```(?:markdown|md)?[ \t]*\n(.*?)\n?```\Z", re.S | re.I)
+
+def build_batch_prompt(repos: list, keywords: str = "", language: str = "Korean"):
+    """
+    repos: [(repo_id, repo_name, code_context), ...]
+    (system_prompt, user_message) 튜플을 반환
+    """
+    lang_instruction = "한국어로 작성해 주세요." if language == "Korean" else "Write in English."
+
+    keyword_instruction = ""
+    if keywords:
+        keyword_instruction = f"""
+        **Critical Instruction:**
+        Please strongly emphasize the following keywords or technologies in the 'Key Features' or 'Introduction' section of every README:
+        👉 Keywords to highlight: [{keywords}]
+        """
+
+    system_prompt = f"""
+        You are an expert developer and technical writer.
+        Your task is to generate a separate professional `README.md` file for EACH of the {len(repos)} GitHub repositories below.
+        Each repository starts with a line like `<<<REPO R1: name>>>`. Never mix information between repositories.
+
+        {keyword_instruction}
+
+        **Structure (per README):**
+        1. Project Title & Description
+        2. Key Features (Highlight user keywords if provided)
+        3. Tech Stack
+        4. Getting Started
+        5. Usage
+
+        **Rules:**
+        - **Language:** {lang_instruction}
+        - Use clean Markdown syntax.
+        - Be concise but informative.
+
+        **Output Format (strict):**
+        For every repository, output exactly one section and nothing outside the sections:
+        {README_START.format(repo_id="R1")}
+        (README markdown for R1)
+        {README_END}
+        """
+
+    user_message = "\n\n".join(
+        f"{REPO_MARKER.format(repo_id=repo_id, repo_name=repo_name)}\n{code_context}"
+        for repo_id, repo_name, code_context in repos
+    )
+    return system_prompt, user_message
+
+def parse_batch_response(response: str) -> dict:
+    """
+    배치 응답을 {repo_id: readme} 딕셔너리로 파싱 (바깥 코드 펜스 한 겹은 벗기고, 제목(#)이 없는 빈약한 섹션은 버림)
+    """
+    sections = {}
+    for repo_id, readme in README_SECTION_PATTERN.findall(response or ""):
+        readme = readme.strip()
+        fenced = OUTER_FENCE_PATTERN.match(readme)
+        if fenced:
+            readme = fenced.group(1).strip()
+        if readme and "#" in readme:
+            sections[repo_id] = readme
+    return sections
+
+def pack_repos(token_counts: list, token_budget: int, small_repo_tokens: int, max_repos_per_batch: int):
+    """
+    작은 레포들을 토큰 예산 안에서 First-Fit Decreasing으로 묶음
+    (batches: 인덱스 리스트의 리스트, singles: 개별 요청할 인덱스 리스트) 반환
+    """
+    small = [i for i, tokens in enumerate(token_counts) if tokens <= small_repo_tokens]
+    singles = [i for i, tokens in enumerate(token_counts) if tokens > small_repo_tokens]
+
+    bins = [] # [[남은 예산, [인덱스...]], ...]
+    for idx in sorted(small, key=lambda i: token_counts[i], reverse=True):
+        for b in bins:
+            if b[0] >= token_counts[idx] and len(b[1]) < max_repos_per_batch:
+                b[0] -= token_counts[idx]
+                b[1].append(idx)
+                break
+        else:
+            bins.append([token_budget - token_counts[idx], [idx]])
+
+    batches = []
+    for _, indices in bins:
+        # 혼자 남은 레포는 묶을 이유가 없으므로 개별 요청
+        if len(indices) == 1:
+            singles.append(indices[0])
+        else:
+            batches.append(sorted(indices))
+    return batches, sorted(singles)
+
+class BatchReadmeGenerator:
+    """
+    작은 레포 여러 개를 하나의 LLM 요청으로 묶어 README를 생성 (RPM 절약)
+    섹션 파싱에 실패한 레포는 개별 요청으로 다시 생성함
+    """
+    def __init__(self, provider: BaseAIProvider, token_budget: int = 24000, small_repo_tokens: int = 4000,
+                 max_repos_per_batch: int = 5, logger: logging.Logger = None):
+        self.provider = provider
+        self.token_budget = token_budget
+        self.small_repo_tokens = small_repo_tokens
+        # 응답(출력) 토큰 한도 때문에 한 번에 너무 많은 README를 요청하지 않음
+        self.max_repos_per_batch = max_repos_per_batch
+        self.logger = logger
+
+    async def _generate_batch(self, indices, repo_names, contents, keywords, language) -> dict:
+        repos = [(f"R{n + 1}", repo_names[idx], contents[idx]) for n, idx in enumerate(indices)]
+        system_prompt, user_message = build_batch_prompt(repos, keywords, language)
+
+        response = await self.provider.complete(system_prompt, user_message)
+
+        if is_error_response(response):
+            if self.logger: self.logger.error(f"배치 요청 실패 ({len(indices)}개 레포): {response[:200]}")
+            return {}
+
+        sections = parse_batch_response(response)
+        return {idx: sections[repo_id] for (repo_id, _, _), idx in zip(repos, indices) if repo_id in sections}
+
+    async def generate_all(self, repo_names: list, contents: list, keywords: str = "", language: str = "Korean") -> list:
+        token_counts = [estimate_tokens(content) for content in contents]
+        batches, singles = pack_repos(token_counts, self.token_budget, self.small_repo_tokens, self.max_repos_per_batch)
+
+        if self.logger:
+            self.logger.debug(f"📦 배치 {len(batches)}개 ({sum(len(b) for b in batches)}개 레포), 개별 요청 {len(singles)}개")
+
+        results = [None] * len(repo_names)
+
+        async def generate_single(idx):
+            results[idx] = await self.provider.generate_readme(repo_names[idx], contents[idx], keywords, language)
+
+        async def generate_batch(indices):
+            sections = await self._generate_batch(indices, repo_names, contents, keywords, language)
+            failed = [idx for idx in indices if idx not in sections]
+            for idx, readme in sections.items():
+                results[idx] = readme
+
+            if failed:
+                if self.logger: self.logger.debug(f"↩️ 배치 응답 파싱 실패 {len(failed)}개 → 개별 요청으로 재시도")
+                await asyncio.gather(*[generate_single(idx) for idx in failed])
+
+        await asyncio.gather(
+            *[generate_batch(indices) for indices in batches],
+            *[generate_single(idx) for idx in singles]
+        )
+        return results
\ No newline at end of file
@@ -0,0 +1,197 @@
+import os
+import json
+import random
+import asyncio
+import hashlib
+
+from .base import BaseAIProvider, is_error_response
+from .batching import REPO_MARKER_PATTERN, README_START, README_END
+
+def prompt_hash(repo_name: str, code_context: str, keywords: str = "", language: str = "Korean") -> str:
+    """
+    프롬프트를 구성하는 입력값들로 고유 해시를 만듦 (녹화/재생 키로 사용)
+    """
+    h = hashlib.sha256()
+    for part in (repo_name, code_context, keywords or "", language):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+def _read_entries(record_path: str):
+    if not os.path.exists(record_path):
+        return
+    with open(record_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def load_recordings(record_path: str) -> dict:
+    """
+    JSONL 녹화 파일을 {prompt_hash: response} 딕셔너리로 읽음
+    """
+    return {entry["key"]: entry["response"] for entry in _read_entries(record_path)}
+
+def load_recorded_requests(record_path: str) -> list:
+    """
+    녹화된 generate_readme 요청들을 [(repo_name, code_context, keywords, language), ...]로 읽음
+    (replay 부하 테스트에서 녹화 당시와 같은 프롬프트를 다시 보내는 데 사용)
+    """
+    requests = []
+    seen = set()
+    for entry in _read_entries(record_path):
+        if entry.get("method") != "generate_readme" or entry["key"] in seen:
+            continue
+        seen.add(entry["key"])
+        requests.append(tuple(entry["args"]))
+    return requests
+
+class FakeProvider(BaseAIProvider):
+    """
+    실제 API를 호출하지 않는 부하 테스트용 Provider
+
+    - fake 모드: 입력에 따라 결정적인 README를 생성. 지연시간 분포, 토큰 처리량, 429/5xx 에러를 흉내냄
+    - replay 모드: 미리 녹화된 응답을 프롬프트 해시로 찾아서 반환 (지연시간/에러/동시성 제한은 fake 모드와 동일하게 흉내냄)
+    """
+    def __init__(self, mode: str = "fake", seed: int = 0,
+                 latency: str = "lognormal", latency_mean: float = 1.0, latency_sigma: float = 0.5,
+                 tokens_per_second: float = 0.0, error_rate_429: float = 0.0, error_rate_5xx: float = 0.0,
+                 record_path: str = None, max_concurrency: int = 3):
+        if mode not in ("fake", "replay"):
+            raise ValueError(f"지원하지 않는 FakeProvider 모드입니다: {mode}")
+        if mode == "replay" and not record_path:
+            raise ValueError("replay 모드에는 record_path가 필요합니다.")
+
+        self.mode = mode
+        self.seed = seed
+        self.latency = latency
+        self.latency_mean = latency_mean
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_rate_429 = error_rate_429
+        self.error_rate_5xx = error_rate_5xx
+        self.recordings = load_recordings(record_path) if mode == "replay" else {}
+        # 실제 Provider처럼 동시 요청 수를 제한해서 파이프라인 동작을 재현
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _rng(self, key: str) -> random.Random:
+        # 같은 seed + 같은 프롬프트면 항상 같은 결과 (지연시간/에러 포함)
+        return random.Random(f"{self.seed}:{key}")
+
+    def _sample_latency(self, rng: random.Random) -> float:
+        if self.latency == "fixed":
+            return self.latency_mean
+        if self.latency == "uniform":
+            low = max(0.0, self.latency_mean - self.latency_sigma)
+            return rng.uniform(low, self.latency_mean + self.latency_sigma)
+        if self.latency == "lognormal":
+            # latency_mean이 분포의 중앙값(median)이 되도록 설정
+            if self.latency_mean <= 0:
+                return 0.0
+            return rng.lognormvariate(0.0, self.latency_sigma) * self.latency_mean
+        raise ValueError(f"지원하지 않는 지연시간 분포입니다: {self.latency}")
+
+    def _fake_readme(self, rng: random.Random, repo_name: str, code_context: str, keywords: str, language: str) -> str:
+        file_count = code_context.count("### File:")
+        title = "소개" if language == "Korean" else "Introduction"
+        lines = [
+            f"# {repo_name}",
+            "",
+            f"## {title}",
+            f"Fake README generated offline (seed={self.seed}, files={file_count}, id={rng.getrandbits(32):08x}).",
+            "",
+            "## Key Features",
+        ]
+        for keyword in [k.strip() for k in (keywords or "").split(",") if k.strip()]:
+            lines.append(f"- {keyword}")
+        lines += ["", "## Getting Started", "```bash", f"git clone {repo_name}", "```"]
+        return "\n".join(lines)
+
+    async def generate_readme(self, repo_name: str, code_context: str, keywords: str = "", language: str = "Korean") -> str:
+        key = prompt_hash(repo_name, code_context, keywords, language)
+
+        rng = self._rng(key)
+
+        if self.mode == "replay":
+            if key not in self.recordings:
+                return f"Error (Replay): 녹화된 응답이 없습니다 - {repo_name} ({key[:12]})"
+            return await self._simulate(rng, self.recordings[key])
+
+        return await self._simulate(rng, self._fake_readme(rng, repo_name, code_context, keywords, language))
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        key = prompt_hash(system_prompt, user_message)
+        rng = self._rng(key)
+
+        if self.mode == "replay":
+            if key not in self.recordings:
+                return f"Error (Replay): 녹화된 응답이 없습니다 - complete ({key[:12]})"
+            return await self._simulate(rng, self.recordings[key])
+
+        repos = REPO_MARKER_PATTERN.findall(user_message)
+        if repos:
+            # 배치 프롬프트면 레포마다 섹션을 만들어 배치 파이프라인도 오프라인으로 테스트 가능하게 함
+            text = "\n\n".join(
+                f"{README_START.format(repo_id=repo_id)}\n{self._fake_readme(rng, repo_name, '', '', 'English')}\n{README_END}"
+                for repo_id, repo_name in repos
+            )
+        else:
+            text = f"Fake completion (seed={self.seed}, id={rng.getrandbits(32):08x})"
+        return await self._simulate(rng, text)
+
+    async def _simulate(self, rng: random.Random, readme: str) -> str:
+        """
+        지연시간/에러/토큰 처리량을 흉내내며 readme를 반환
+        """
+        delay = self._sample_latency(rng)
+        roll = rng.random()
+
+        async with self.call_slot():
+            if roll < self.error_rate_429:
+                # 레이트 리밋은 보통 빨리 실패함
+                await asyncio.sleep(delay * 0.1)
+                return "Error (Fake): 429 Resource has been exhausted (e.g. check quota)."
+            if roll < self.error_rate_429 + self.error_rate_5xx:
+                await asyncio.sleep(delay)
+                return "Error (Fake): 503 The service is currently unavailable."
+
+            # 출력 토큰 생성 시간 흉내 (대략 4글자 = 1토큰)
+            if self.tokens_per_second > 0:
+                delay += (len(readme) / 4) / self.tokens_per_second
+            await asyncio.sleep(delay)
+            return readme
+
+class RecordingProvider(BaseAIProvider):
+    """
+    실제 Provider를 감싸서 성공한 요청/응답을 JSONL 파일에 녹화 (replay 모드의 입력을 만들 때 사용)
+    요청 인자도 함께 저장하므로 load_test.py --mode replay가 녹화 당시의 프롬프트를 그대로 다시 보낼 수 있음
+    """
+    def __init__(self, provider: BaseAIProvider, record_path: str):
+        self.provider = provider
+        self.record_path = record_path
+        self.lock = asyncio.Lock()
+
+    async def generate_readme(self, repo_name: str, code_context: str, keywords: str = "", language: str = "Korean") -> str:
+        response = await self.provider.generate_readme(repo_name, code_context, keywords, language)
+
+        if not is_error_response(response):
+            args = [repo_name, code_context, keywords, language]
+            await self._record(prompt_hash(*args), "generate_readme", args, response)
+
+        return response
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        response = await self.provider.complete(system_prompt, user_message)
+        if not is_error_response(response):
+            args = [system_prompt, user_message]
+            await self._record(prompt_hash(*args), "complete", args, response)
+        return response
+
+    async def _record(self, key: str, method: str, args: list, response: str):
+        entry = {"key": key, "method": method, "args": args, "response": response}
+        async with self.lock:
+            record_dir = os.path.dirname(self.record_path)
+            if record_dir:
+                os.makedirs(record_dir, exist_ok=True)
+            with open(self.record_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
\ No newline at end of file
@@ -47,7 +47,10 @@ class GeminiProvider(BaseAIProvider):
         {code_context}
         """
 
-        async with self.semaphore:
+        return await self.complete(system_prompt, user_message)
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        async with self.call_slot():
             try:
                 response = await self.model.generate_content_async(
                     contents=[system_prompt, user_message],
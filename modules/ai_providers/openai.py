@@ -7,18 +7,25 @@ class OpenAIProvider(BaseAIProvider):
         self.client = AsyncOpenAI(api_key=api_key)
         self.model_name = model_name
 
-    async def generate_readme(self, repo_name: str, code_context: str) -> str:
-        system_prompt = f"You are an expert developer. Generate a README.md for {repo_name}."
-        
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Context:\n{code_context}"}
-                ],
-                temperature=0.2
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"Error (OpenAI): {str(e)}"
\ No newline at end of file
+    async def generate_readme(self, repo_name: str, code_context: str, keywords: str = "", language: str = "Korean") -> str:
+        lang_instruction = "한국어로 작성해 주세요." if language == "Korean" else "Write in English."
+        system_prompt = f"You are an expert developer. Generate a README.md for {repo_name}. {lang_instruction}"
+        if keywords:
+            system_prompt += f" Emphasize these keywords: [{keywords}]"
+
+        return await self.complete(system_prompt, f"Context:\n{code_context}")
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        async with self.call_slot():
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_message}
+                    ],
+                    temperature=0.2
+                )
+                return response.choices[0].message.content
+            except Exception as e:
+                return f"Error (OpenAI): {str(e)}"
\ No newline at end of file
@@ -0,0 +1,263 @@
+import asyncio
+import time
+from collections import deque
+
+from .base import BaseAIProvider, is_error_response, start_call_timer
+
+# 지연시간 통계를 낼 때 사용할 최근 요청 개수
+LATENCY_WINDOW = 50
+# p95를 믿을 수 있으려면 최소 이 정도 샘플은 있어야 함
+MIN_SAMPLES_FOR_P95 = 5
+# 연속 실패 시 해당 백엔드를 잠시 쉬게 하는 시간 (초)
+FAILURE_COOLDOWN = 30.0
+# 이 횟수만큼 연속 실패하면 쿨다운 진입
+MAX_CONSECUTIVE_FAILURES = 3
+# EWMA 가중치 (최근 값에 얼마나 민감하게 반응할지)
+EWMA_ALPHA = 0.3
+# 아직 성공 기록이 없는 백엔드의 지연시간 추정치 (초). 다른 백엔드 기록이 있으면 그중 가장 빠른 값을 사용
+DEFAULT_LATENCY_ESTIMATE = 1.0
+# 동시에 떠 있을 수 있는 hedge(중복) 요청 수 상한 (쿼터 보호)
+MAX_INFLIGHT_HEDGES = 2
+# 주 요청이 아직 Provider의 세마포어를 기다리는 동안 hedge 타이머를 다시 확인하는 간격 (초)
+HEDGE_POLL_INTERVAL = 0.25
+# hedge를 허용할 메서드. 배치 요청(complete)은 중복 전송 시 README 여러 개 분량의 쿼터를 쓰므로 제외
+HEDGE_METHODS = {"generate_readme"}
+
+class BackendStats:
+    """
+    백엔드 하나에 대한 실시간 지연시간/에러율 통계
+    지연시간은 메서드별로 따로 관리 (README 여러 개를 묶은 배치 요청은 단건 요청보다 당연히 오래 걸림)
+    """
+    def __init__(self):
+        self.latencies = {}      # 메서드 -> 최근 지연시간 deque
+        self.ewma_latency = {}   # 메서드 -> EWMA 지연시간
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.cancelled = 0
+        # 보냈지만 아직 끝나지 않은 요청 수 (gather로 한꺼번에 보낼 때 한 백엔드에 몰리지 않게 함)
+        self.inflight = 0
+
+    def record(self, method: str, latency: float, ok: bool):
+        self.requests += 1
+        self.error_rate = (1 - EWMA_ALPHA) * self.error_rate + EWMA_ALPHA * (0.0 if ok else 1.0)
+
+        if ok:
+            # 실패한 요청의 지연시간은 (빠른 429 등) 왜곡이 심해서 성공한 것만 반영
+            self._add_latency(method, latency)
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                self.cooldown_until = time.monotonic() + FAILURE_COOLDOWN
+
+    def record_cancelled(self, method: str, elapsed: float):
+        """
+        hedge 경쟁에서 져서 취소된 요청: 실제 지연시간은 최소 elapsed 이상이므로 하한값으로 반영
+        (기록하지 않으면 느린 백엔드가 계속 '시도해 본 적 없음'으로 남아 매번 최우선이 됨)
+        """
+        self.requests += 1
+        self.cancelled += 1
+        self._add_latency(method, elapsed)
+
+    def _add_latency(self, method: str, latency: float):
+        self.latencies.setdefault(method, deque(maxlen=LATENCY_WINDOW)).append(latency)
+        previous = self.ewma_latency.get(method)
+        if previous is None:
+            self.ewma_latency[method] = latency
+        else:
+            self.ewma_latency[method] = (1 - EWMA_ALPHA) * previous + EWMA_ALPHA * latency
+
+    def is_healthy(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    def p95(self, method: str):
+        latencies = self.latencies.get(method, ())
+        if len(latencies) < MIN_SAMPLES_FOR_P95:
+            return None
+        ordered = sorted(latencies)
+        idx = min(len(ordered) - 1, int(len(ordered) * 0.95))
+        return ordered[idx]
+
+    def score(self, method: str, latency_estimate: float = DEFAULT_LATENCY_ESTIMATE) -> float:
+        """
+        낮을수록 좋은 점수 (예상 대기시간 = 지연시간 * (진행 중인 요청 수 + 1))
+        해당 메서드로 아직 성공한 적 없는 백엔드는 latency_estimate를 지연시간으로 가정함
+        """
+        latency = self.ewma_latency.get(method)
+        if latency is None:
+            if self.failures and not self.ewma_latency:
+                # 성공 기록 없이 실패만 있다면 가장 뒤로 보냄
+                return float("inf")
+            if self.inflight == 0:
+                # 한 번은 시도되도록 최우선
+                return 0.0
+            latency = latency_estimate
+        # 에러율이 높을수록 실질적인 지연시간이 늘어난다고 보고 보정
+        return latency * (self.inflight + 1) / max(1e-3, 1.0 - self.error_rate)
+
+class RouterProvider(BaseAIProvider):
+    """
+    여러 Provider(백엔드/모델)를 묶어 하나의 Provider처럼 동작하게 하는 라우터
+
+    - 가장 빠르고 건강한 백엔드로 요청을 보냄
+    - (선택) 단건 요청이 p95 시간이 지나도 응답이 없으면 다른 백엔드로 중복 요청(hedge)
+    - 실패 시 다음 백엔드로 폴백
+    """
+    def __init__(self, backends: list, hedge: bool = True, default_hedge_delay: float = 20.0,
+                 max_inflight_hedges: int = MAX_INFLIGHT_HEDGES, stats: dict = None):
+        """
+        backends: [(라벨, Provider 인스턴스), ...] 형태의 리스트. 순서가 기본 우선순위가 됨
+        stats: {라벨: BackendStats} 딕셔너리. 넘기면 라우터를 새로 만들어도 통계(에러율, 쿨다운 등)가 이어짐
+        """
+        if not backends:
+            raise ValueError("라우터에는 최소 1개의 백엔드가 필요합니다.")
+
+        self.backends = list(backends)
+        self.stats = stats if stats is not None else {}
+        for label, _ in self.backends:
+            self.stats.setdefault(label, BackendStats())
+        self.hedge = hedge
+        self.default_hedge_delay = default_hedge_delay
+        self.max_inflight_hedges = max_inflight_hedges
+        self.inflight_hedges = 0
+
+    def _rank_backends(self, method: str) -> list:
+        """
+        건강한 백엔드를 점수순으로 먼저, 쿨다운 중인 백엔드는 맨 뒤에 배치
+        (모두 쿨다운 중이어도 요청 자체는 시도해야 하므로 제외하지는 않음)
+        """
+        order = {label: i for i, (label, _) in enumerate(self.backends)}
+        healthy = [b for b in self.backends if self.stats[b[0]].is_healthy()]
+        cooling = [b for b in self.backends if not self.stats[b[0]].is_healthy()]
+
+        known = [s.ewma_latency[method] for s in self.stats.values() if method in s.ewma_latency]
+        latency_estimate = min(known) if known else DEFAULT_LATENCY_ESTIMATE
+
+        healthy.sort(key=lambda b: (self.stats[b[0]].score(method, latency_estimate), order[b[0]]))
+        cooling.sort(key=lambda b: self.stats[b[0]].cooldown_until)
+        return healthy + cooling
+
+    def _hedge_delay(self, label: str, method: str) -> float:
+        p95 = self.stats[label].p95(method)
+        return p95 if p95 is not None else self.default_hedge_delay
+
+    def _launch(self, pending, backend, method, args, kwargs):
+        # 진행 중 요청 수는 태스크가 실제로 돌기 전에 올려야 바로 다음 요청의 순위 계산에 반영됨
+        stats = self.stats[backend[0]]
+        stats.inflight += 1
+        timer = {}
+        task = asyncio.create_task(self._call(backend, timer, method, args, kwargs))
+        # 시작도 하기 전에 취소된 태스크까지 확실히 빼도록 완료 콜백에서 감소
+        task.add_done_callback(lambda _: setattr(stats, "inflight", stats.inflight - 1))
+        pending[task] = (backend, timer)
+        return task
+
+    def _launch_hedge(self, pending, backend, method, args, kwargs):
+        self.inflight_hedges += 1
+        task = self._launch(pending, backend, method, args, kwargs)
+        task.add_done_callback(self._hedge_done)
+
+    def _hedge_done(self, task):
+        self.inflight_hedges -= 1
+
+    async def _call(self, backend, timer, method, args, kwargs):
+        label, provider = backend
+        # Provider가 세마포어를 잡고 실제 호출을 시작하면 timer["started"]가 기록됨
+        start_call_timer(timer)
+        start = time.monotonic()
+        try:
+            result = await getattr(provider, method)(*args, **kwargs)
+            ok = not is_error_response(result)
+        except asyncio.CancelledError:
+            # hedge 경쟁에서 진 요청은 그때까지 걸린 시간을 지연시간의 하한값으로 기록
+            self.stats[label].record_cancelled(method, time.monotonic() - timer.get("started", start))
+            raise
+        except Exception as e:
+            result = f"Error ({label}): {str(e)}"
+            ok = False
+
+        # 세마포어 대기 시간은 빼고 실제 호출 시간만 반영
+        self.stats[label].record(method, time.monotonic() - timer.get("started", start), ok)
+        return ok, result
+
+    async def generate_readme(self, repo_name: str, code_context: str, keywords: str = "", language: str = "Korean") -> str:
+        return await self._route("generate_readme", (repo_name, code_context), {"keywords": keywords, "language": language})
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        return await self._route("complete", (system_prompt, user_message), {})
+
+    def _hedge_deadline(self, pending, method):
+        """
+        주 요청 하나만 떠 있을 때의 hedge 시각 (monotonic). 아직 실제 호출이 시작되지 않았으면 None
+        """
+        (label, _), timer = next(iter(pending.values()))
+        started = timer.get("started")
+        if started is None:
+            return None
+        return started + self._hedge_delay(label, method)
+
+    async def _route(self, method, args, kwargs):
+        candidates = self._rank_backends(method)
+        pending = {} # task -> (backend, timer)
+        last_error = None
+        hedge = self.hedge and method in HEDGE_METHODS
+
+        try:
+            while candidates or pending:
+                if not pending:
+                    self._launch(pending, candidates.pop(0), method, args, kwargs)
+
+                # 요청이 하나만 떠 있고 대기 후보가 있을 때만 hedge 타이머를 검
+                can_hedge = (hedge and candidates and len(pending) == 1
+                             and self.inflight_hedges < self.max_inflight_hedges)
+                timeout = None
+                if can_hedge:
+                    deadline = self._hedge_deadline(pending, method)
+                    # 세마포어 대기 중이면 hedge 기준 시간이 아직 시작되지 않았으므로 잠시 후 다시 확인
+                    timeout = HEDGE_POLL_INTERVAL if deadline is None else max(0.0, deadline - time.monotonic())
+
+                done, _ = await asyncio.wait(pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    deadline = self._hedge_deadline(pending, method)
+                    if deadline is not None and time.monotonic() >= deadline and self.inflight_hedges < self.max_inflight_hedges:
+                        # 실제 호출이 p95를 넘겼으므로 다음 백엔드로 중복 요청을 보냄
+                        self._launch_hedge(pending, candidates.pop(0), method, args, kwargs)
+                    continue
+
+                for task in done:
+                    pending.pop(task)
+                    ok, result = task.result()
+                    if ok:
+                        return result
+                    last_error = result
+        finally:
+            # 먼저 끝난 요청이 있으면 나머지(hedge) 요청은 취소
+            for task in pending:
+                task.cancel()
+
+        return last_error or "Error (Router): 사용 가능한 백엔드가 없습니다."
+
+    def get_stats(self) -> dict:
+        """
+        백엔드별 통계 스냅샷 (대시보드/로그 출력용)
+        """
+        labels = {label for label, _ in self.backends}
+        return {
+            label: {
+                "requests": s.requests,
+                "failures": s.failures,
+                "cancelled": s.cancelled,
+                "inflight": s.inflight,
+                "ewma_latency": dict(s.ewma_latency),
+                "p95_latency": {method: s.p95(method) for method in s.latencies},
+                "error_rate": round(s.error_rate, 3),
+                "healthy": s.is_healthy(),
+            }
+            for label, s in self.stats.items()
+            if label in labels
+        }
\ No newline at end of file
@@ -1,18 +1,31 @@
 import os
 import logging
 
-from dotenv import load_dotenv
-from github import Github
-
 import utils
+
+# 캐시 유지 시간 (초)
+REPO_LIST_TTL = 10 * 60             # 레포 목록: 10분간은 그대로 사용
+REPO_LIST_STALE_TTL = 7 * 24 * 3600 # 그 이후 일주일까지는 오래된 값을 먼저 보여주고 백그라운드 갱신
+HEAD_SHA_TTL = 30 * 24 * 3600       # HEAD SHA: pushed_at이 키에 포함되므로 푸시 전까지는 변하지 않음
+PRIVATE_ARCHIVE_TTL = 4 * 60        # 프라이빗 아카이브 링크에는 만료되는 토큰이 붙어 있어 짧게 유지
     
 class RepoDownloader:
-    def __init__(self, logger: logging.Logger):
-        load_dotenv()
-        ACCESS_TOKEN = os.getenv("GITHUB_TOKEN")
-
-        self.git_hub = Github(ACCESS_TOKEN)
+    def __init__(self, logger: logging.Logger, metadata_cache: "utils.MetadataCache" = None):
         self.logger = logger
+        self.metadata_cache = metadata_cache
+        self._git_hub = None
+
+    @property
+    def git_hub(self):
+        # PyGithub은 import 비용이 커서 GitHub API가 처음 필요할 때 생성 (캐시만으로 충분하면 로딩하지 않음)
+        if self._git_hub is None:
+            from dotenv import load_dotenv
+            from github import Github
+
+            load_dotenv()
+            ACCESS_TOKEN = os.getenv("GITHUB_TOKEN")
+            self._git_hub = Github(ACCESS_TOKEN)
+        return self._git_hub
     
     def get_repos_from_git_hub(self, target_username: str) -> list:
         user = self.git_hub.get_user(target_username)
@@ -36,6 +49,72 @@ class RepoDownloader:
         archive_pairs = list(zip(archive_names, archive_links))
         
         return archive_pairs
+
+    def _cached(self, namespace: str, key: str, fetch_fn, ttl: float, stale_ttl: float = 0, force: bool = False):
+        # 캐시가 설정되지 않았으면 매번 새로 가져옴
+        if self.metadata_cache is None:
+            return fetch_fn()
+        return self.metadata_cache.get_or_fetch(namespace, key, fetch_fn, ttl, stale_ttl, force=force)
+
+    def get_repo_metadata(self, target_username: str, force_refresh: bool = False) -> list:
+        """
+        유저의 레포 목록을 JSON으로 저장 가능한 딕셔너리 리스트로 반환 (영구 캐시 사용)
+        force_refresh면 캐시를 건너뛰고 GitHub에서 바로 가져옴 (실패 시에만 캐시값 사용)
+        """
+        def fetch():
+            return [
+                {
+                    "id": repo.id,
+                    "name": repo.name,
+                    "full_name": repo.full_name,
+                    "private": repo.private,
+                    "fork": repo.fork,
+                    "archived": repo.archived,
+                    "language": repo.language,
+                    "size": repo.size,
+                    "default_branch": repo.default_branch,
+                    "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
+                }
+                for repo in self.get_repos_from_git_hub(target_username)
+            ]
+
+        return self._cached("repos", target_username.lower(), fetch, REPO_LIST_TTL, REPO_LIST_STALE_TTL, force=force_refresh)
+
+    def get_head_sha(self, repo_meta: dict) -> str:
+        """
+        기본 브랜치의 HEAD SHA (pushed_at이 바뀌었을 때만 GitHub API를 호출)
+        실패(레이트 리밋, 빈 레포의 404 등)는 캐시하지 않고 예외를 그대로 전파함
+        """
+        def fetch():
+            repo = self.git_hub.get_repo(repo_meta["full_name"], lazy=True)
+            return repo.get_branch(repo_meta["default_branch"]).commit.sha
+
+        key = f"{repo_meta['full_name']}@{repo_meta['pushed_at']}"
+        return self._cached("head_sha", key, fetch, HEAD_SHA_TTL)
+
+    def get_archive_link(self, repo_meta: dict) -> str:
+        """
+        레포 메타데이터로 zip 다운로드 링크를 구함
+        공개 레포는 API 호출 없이 링크를 만들고, 프라이빗 레포만 토큰이 포함된 링크를 API로 받아옴
+        """
+        if not repo_meta["private"]:
+            return f"https://github.com/{repo_meta['full_name']}/archive/refs/heads/{repo_meta['default_branch']}.zip"
+
+        def fetch():
+            return self.git_hub.get_repo(repo_meta["full_name"], lazy=True).get_archive_link('zipball')
+
+        return self._cached("archive_link", repo_meta["full_name"], fetch, PRIVATE_ARCHIVE_TTL)
+
+    def get_archive_links_cached(self, repo_metadata: list, only_download_public: bool = True) -> list:
+        """
+        get_archive_links와 같은 (이름, 링크) 리스트를 반환하지만, 메타데이터 캐시를 사용함
+        """
+        archive_pairs = []
+        for repo_meta in repo_metadata:
+            if only_download_public and repo_meta["private"]:
+                continue
+            archive_pairs.append((repo_meta["name"], self.get_archive_link(repo_meta)))
+        return archive_pairs
     
     async def download_all_repos_async(self, user_name: str, archive_pairs: list, download_dir: str) -> list:
         downloaded_file_paths = []
@@ -50,7 +129,10 @@ class RepoDownloader:
             if is_success:
                 ziped_file_path = os.path.join(new_download_dir, filename)
                 
-                downloaded_file_path, folder_name = utils.file_manager.unzip_and_clean(ziped_file_path, new_download_dir, self.logger)
+                unzipped = utils.file_manager.unzip_and_clean(ziped_file_path, new_download_dir, self.logger)
+                if unzipped is None:
+                    continue # 압축 해제 실패 (깨진 zip은 unzip_and_clean에서 삭제됨)
+                downloaded_file_path, folder_name = unzipped
                 downloaded_file_paths.append(os.path.join(downloaded_file_path, folder_name))
                 repo_names.append(archive_pair[0])
         
@@ -1,3 +1,21 @@
-from .logger import setup_logger
-from .downloader import download_file, download_all_async
-from .file_manager import unzip_and_clean, folder_to_markdown
\ No newline at end of file
+import importlib
+
+# 필요한 유틸만 로딩되도록 지연 import (asyncio, sqlite3 등은 실제로 쓸 때만 불러옴)
+_LAZY_EXPORTS = {
+    "setup_logger": ".logger",
+    "download_file": ".downloader",
+    "download_all_async": ".downloader",
+    "unzip_and_clean": ".file_manager",
+    "folder_to_markdown": ".file_manager",
+    "MetadataCache": ".metadata_cache",
+}
+_SUBMODULES = {"logger", "downloader", "file_manager", "metadata_cache", "skeleton", "dedup"}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    if name in _SUBMODULES:
+        # "import utils" 후 utils.downloader처럼 하위 모듈에 바로 접근하는 경우
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,127 @@
+import re
+import zlib
+import hashlib
+
+# 이보다 작은 파일(빈 __init__.py 등)은 중복 참조 문구가 오히려 더 길어서 그대로 둠
+MIN_DEDUP_BYTES = 64
+# 유사 중복 검사 대상 크기 범위 (너무 큰 파일은 MinHash 계산 비용이 커서 제외)
+MAX_NEAR_DUP_BYTES = 512 * 1024
+# 단어 n-gram 크기
+SHINGLE_SIZE = 5
+# MinHash 해시 함수 개수 = BANDS * ROWS (LSH 밴딩)
+BANDS = 16
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+# 추정 Jaccard 유사도가 이 이상이면 유사 중복으로 판단
+NEAR_DUP_THRESHOLD = 0.85
+# 파일 하나에서 MinHash에 넣을 shingle 수 상한 (넘으면 해시값 기준으로 일정 비율만 샘플링)
+MAX_SHINGLES = 512
+
+# 해시 순열용 상수 (고정 시드라서 실행마다 결과가 같음)
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.sha256(f"a{i}".encode()).digest()[:8], "big") % _PRIME | 1,
+     int.from_bytes(hashlib.sha256(f"b{i}".encode()).digest()[:8], "big") % _PRIME)
+    for i in range(NUM_PERM)
+]
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def _shingle_hashes(content: str) -> set:
+    tokens = TOKEN_PATTERN.findall(content)
+    if len(tokens) < SHINGLE_SIZE:
+        return set()
+    return {
+        zlib.crc32(" ".join(tokens[i:i + SHINGLE_SIZE]).encode("utf-8"))
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+def _sample_hashes(hashes: set) -> set:
+    """
+    shingle이 MAX_SHINGLES보다 많으면 해시값이 2^k의 배수인 것만 남김
+    해시값 기준 샘플링이라 크기가 비슷한 두 파일은 같은 shingle을 골라 유사도 추정이 유지됨
+    (크기 차이로 k가 달라지면 유사도가 낮게 나올 뿐이라 잘못 중복으로 판단하지는 않음)
+    """
+    step = 1
+    while len(hashes) > MAX_SHINGLES * step:
+        step *= 2
+    if step == 1:
+        return hashes
+    return {h for h in hashes if h % step == 0}
+
+def minhash_signature(content: str) -> tuple:
+    """
+    단어 shingle 집합의 MinHash 시그니처 (shingle이 부족하면 None)
+    """
+    hashes = _sample_hashes(_shingle_hashes(content))
+    if not hashes:
+        return None
+    return tuple(
+        min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+def estimate_similarity(sig1: tuple, sig2: tuple) -> float:
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / NUM_PERM
+
+class ContentDeduplicator:
+    """
+    폴더를 순회하면서 파일 내용을 등록하고, 이미 본 파일과 같거나 거의 같은지 판별
+
+    - 완전 중복: 내용의 SHA-256 해시 비교
+    - 유사 중복(선택): MinHash + LSH 밴딩으로 후보를 찾고 추정 유사도로 확인
+    """
+    def __init__(self, near_duplicates: bool = False):
+        self.near_duplicates = near_duplicates
+        self.exact = {}             # sha256 -> 처음 등장한 파일 경로
+        self.buckets = {}           # (band 번호, band 해시) -> [(경로, 시그니처), ...]
+        self.duplicate_count = 0
+        self.bytes_saved = 0
+
+    def check(self, rel_path: str, content: str):
+        """
+        중복이면 (완전 중복 여부, 원본 경로, 추정 유사도) 반환, 아니면 등록 후 None 반환
+        """
+        size = len(content.encode("utf-8"))
+        if size < MIN_DEDUP_BYTES:
+            return None
+
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if digest in self.exact:
+            self._count(size)
+            return True, self.exact[digest], 1.0
+        self.exact[digest] = rel_path
+
+        if not self.near_duplicates or size > MAX_NEAR_DUP_BYTES:
+            return None
+
+        signature = minhash_signature(content)
+        if signature is None:
+            return None
+
+        bands = [(i, signature[i * ROWS:(i + 1) * ROWS]) for i in range(BANDS)]
+
+        # 같은 밴드가 하나라도 겹치는 후보 중 가장 비슷한 파일 선택
+        best_path, best_similarity = None, 0.0
+        seen = set()
+        for band in bands:
+            for candidate_path, candidate_sig in self.buckets.get(band, []):
+                if candidate_path in seen:
+                    continue
+                seen.add(candidate_path)
+                similarity = estimate_similarity(signature, candidate_sig)
+                if similarity > best_similarity:
+                    best_path, best_similarity = candidate_path, similarity
+
+        if best_path is not None and best_similarity >= NEAR_DUP_THRESHOLD:
+            self._count(size)
+            return False, best_path, best_similarity
+
+        for band in bands:
+            self.buckets.setdefault(band, []).append((rel_path, signature))
+        return None
+
+    def _count(self, size: int):
+        self.duplicate_count += 1
+        self.bytes_saved += size
\ No newline at end of file
@@ -1,7 +1,5 @@
 import os
 import asyncio
-import aiohttp
-import aiofiles  # 비동기 파일 쓰기용
 
 # 한 번에 동시에 다운로드할 최대 개수 (GitHub API 제한 방지용)
 MAX_CONCURRENT_DOWNLOADS = 10
@@ -10,6 +8,8 @@ async def download_file(session, url, save_path, semaphore, logger=None):
     """
     세마포어를 사용하여 동시 실행 수를 제한하며 파일을 다운로드합니다.
     """
+    import aiofiles  # 비동기 파일 쓰기용 (다운로드할 때만 로딩)
+
     async with semaphore: # 여기서 자리가 날 때까지 기다림
         try:
             async with session.get(url) as response:
@@ -27,12 +27,17 @@ async def download_file(session, url, save_path, semaphore, logger=None):
             
         except Exception as e:
             if logger: logger.error(f"에러 발생 {url}: {e}")
+            # 중간에 끊긴 부분 다운로드 파일은 남기지 않음
+            if os.path.exists(save_path):
+                os.remove(save_path)
             return False
 
 async def download_all_async(pairs, download_dir, logger=None):
     """
     pairs: [(이름, 링크), (이름, 링크), ...] 형태의 리스트
     """
+    import aiohttp
+
     # 세마포어 생성 (동시 5개 제한)
     semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
     
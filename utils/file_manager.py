@@ -3,6 +3,9 @@ import shutil
 import zipfile
 import logging
 
+from .skeleton import needs_skeleton, skeletonize_many
+from .dedup import ContentDeduplicator
+
 # 1. 설정: 무시할 폴더 및 텍스트로 읽을 확장자 정의
 IGNORE_DIRS = {
     '.git', '.svn', '.hg', '.idea', '.vscode', '.vs', 
@@ -20,6 +23,13 @@ TEXT_EXTENSIONS = {
     '.gradle', '.properties', '.dockerfile', 'makefile', 'cmake', '.cmake'
 }
 
+# 토큰 수 추정에 쓰는 평균 바이트 수 (영문 코드 기준 대략 4바이트 = 1토큰)
+BYTES_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 대략적인 토큰 수를 추정"""
+    return len(text.encode("utf-8")) // BYTES_PER_TOKEN
+
 def get_top_level_folder(zip_path):
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
         # 1. 모든 파일/폴더 목록 가져오기
@@ -46,13 +56,15 @@ def unzip_and_clean(zip_path, extract_to, logger: logging.Logger):
     2. 원본 zip 파일 삭제
     3. 단일 폴더로 감싸져 있다면 껍질 벗기기 (내용물을 상위로 이동)
     """
-    top_level_folder = get_top_level_folder(zip_path)
     # 1. 압축 해제
     try:
+        top_level_folder = get_top_level_folder(zip_path)
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
             zip_ref.extractall(extract_to)
     except zipfile.BadZipFile:
         logger.error(f"Error: 잘못된 Zip 파일입니다 - {zip_path}")
+        # 깨진 zip(부분 다운로드 등)은 지워서 작업 폴더에 남지 않게 함
+        os.remove(zip_path)
         return
 
     # 2. 원본 Zip 파일 삭제
@@ -87,9 +99,13 @@ def get_tree_structure(root_dir, prefix=""):
     
     return tree_str
 
-def folder_to_markdown(root_path, output_file, logger: logging.Logger):
+def folder_to_markdown(root_path, output_file, logger: logging.Logger, skeleton: bool = False, dedup: bool = False,
+                      near_dedup: bool = False):
     """
     지정된 폴더를 읽어 하나의 MD 파일로 생성
+    skeleton=True면 핵심 파일을 제외한 코드는 시그니처/docstring만 남긴 스켈레톤으로 넣음
+    dedup=True면 내용이 같은 파일은 한 번만 넣고 나머지는 경로로만 참조
+    near_dedup=True면 거의 같은 파일(MinHash 추정)까지 같은 방식으로 처리 (파일마다 MinHash를 계산하므로 더 느림)
     """
     output = []
     root_abs_path = os.path.abspath(root_path)
@@ -112,6 +128,9 @@ def folder_to_markdown(root_path, output_file, logger: logging.Logger):
     output.append("## 2. File Contents\n")
     
     file_count = 0
+    # 스켈레톤 작업: [(output 인덱스, content, ext), ...] -> 순회가 끝난 뒤 한꺼번에 병렬 처리
+    skeleton_jobs = []
+    deduplicator = ContentDeduplicator(near_duplicates=near_dedup) if dedup else None
     
     for root, dirs, files in os.walk(root_path):
         # 무시할 폴더는 탐색에서 제외 (in-place modification)
@@ -135,10 +154,28 @@ def folder_to_markdown(root_path, output_file, logger: logging.Logger):
                         # Markdown 포맷팅
                         # 언어 힌트 (py, cpp 등) 추출 (점 제거)
                         lang_hint = ext[1:] if ext else ""
+
+                        duplicate = deduplicator.check(rel_path, content) if deduplicator else None
                         
-                        output.append(f"\n### File: `{rel_path}`\n")
-                        output.append(f"```{lang_hint}\n")
-                        output.append(content)
+                        if duplicate:
+                            is_exact, original_path, similarity = duplicate
+                            if is_exact:
+                                output.append(f"\n### File: `{rel_path}` (Duplicate of `{original_path}`)\n")
+                            else:
+                                output.append(f"\n### File: `{rel_path}` (Near-duplicate of `{original_path}`, ~{min(similarity, 0.99):.0%} similar)\n")
+                            output.append("> Content omitted\n")
+                            output.append("---\n")
+                            continue
+                        
+                        if skeleton and needs_skeleton(rel_path):
+                            output.append(f"\n### File: `{rel_path}` (Skeleton)\n")
+                            output.append(f"```{lang_hint}\n")
+                            skeleton_jobs.append((len(output), content, ext))
+                            output.append(None) # 스켈레톤 결과가 들어갈 자리
+                        else:
+                            output.append(f"\n### File: `{rel_path}`\n")
+                            output.append(f"```{lang_hint}\n")
+                            output.append(content)
                         output.append("\n```\n")
                         output.append("---\n") # 파일 간 구분선
                         
@@ -152,6 +189,20 @@ def folder_to_markdown(root_path, output_file, logger: logging.Logger):
                 output.append(f"\n### File: `{rel_path}` (Binary/Asset)\n")
                 output.append("> Content skipped (Non-text file)\n")
 
+    # 스켈레톤 채워 넣기
+    if skeleton_jobs:
+        original_size = sum(len(content) for _, content, _ in skeleton_jobs)
+        skeletons = skeletonize_many([(content, ext) for _, content, ext in skeleton_jobs], logger)
+        for (idx, _, _), skeleton_text in zip(skeleton_jobs, skeletons):
+            output[idx] = skeleton_text
+        logger.debug(f"🦴 스켈레톤 적용: {original_size:,}자 -> {sum(len(t) for t in skeletons):,}자")
+
+    # 중복 제거 결과 보고
+    if deduplicator and deduplicator.duplicate_count:
+        saved_tokens = deduplicator.bytes_saved // BYTES_PER_TOKEN
+        output.append(f"\n> Deduplicated {deduplicator.duplicate_count} files ({deduplicator.bytes_saved:,} bytes, ~{saved_tokens:,} tokens saved)\n")
+        logger.debug(f"♻️ 중복 파일 {deduplicator.duplicate_count}개 제외: {deduplicator.bytes_saved:,} bytes, 약 {saved_tokens:,} 토큰 절약")
+
     # 4. 파일 저장
     final_text = "".join(output)
     with open(output_file, "w", encoding="utf-8") as f:
@@ -1,5 +1,5 @@
+import sys
 import logging
-import streamlit as st
 
 class StreamlitHandler(logging.Handler):
     """
@@ -10,6 +10,9 @@ class StreamlitHandler(logging.Handler):
         
     def emit(self, record):
         try:
+            # setup_logger에서 streamlit이 이미 로딩된 경우에만 이 핸들러를 붙이므로 import 비용 없음
+            import streamlit as st
+
             msg = self.format(record)
             # 세션 스테이트에 'log_lines' 리스트가 없으면 생성
             if 'log_lines' not in st.session_state:
@@ -20,7 +23,14 @@ class StreamlitHandler(logging.Handler):
         except Exception:
             self.handleError(record)
 
-def setup_logger(name="README.ai"):
+def setup_logger(name="README.ai", use_streamlit: bool = None):
+    """
+    use_streamlit이 None이면 streamlit이 이미 import된 경우(대시보드 실행 중)에만 Streamlit 핸들러를 붙임
+    CLI(test.py, load_test.py 등)에서는 streamlit을 로딩하지 않음
+    """
+    if use_streamlit is None:
+        use_streamlit = "streamlit" in sys.modules
+
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
 
@@ -42,8 +52,9 @@ def setup_logger(name="README.ai"):
     logger.addHandler(file_handler)
 
     # 3. Streamlit 핸들러 (대시보드 출력용) 👈 [새로 추가된 부분]
-    st_handler = StreamlitHandler()
-    st_handler.setFormatter(formatter)
-    logger.addHandler(st_handler)
+    if use_streamlit:
+        st_handler = StreamlitHandler()
+        st_handler.setFormatter(formatter)
+        logger.addHandler(st_handler)
 
     return logger
\ No newline at end of file
@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+
+# 기본 캐시 파일 위치 (여러 세션/서버 재시작 간에 공유됨)
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "metadata.sqlite3")
+
+class MetadataCache:
+    """
+    SQLite 기반의 영구 메타데이터 캐시 (모델 목록, 레포 목록, 아카이브 링크 등)
+
+    - ttl 이내: 캐시값을 그대로 반환
+    - ttl ~ ttl + stale_ttl: 오래된 값을 즉시 반환하고 백그라운드 스레드에서 갱신 (stale-while-revalidate)
+    - 그 이후: 동기적으로 다시 가져옴
+    """
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, logger: logging.Logger = None):
+        self.db_path = db_path
+        self.logger = logger
+        # 같은 키에 대해 백그라운드 갱신이 중복으로 돌지 않도록 관리
+        self.refreshing = set()
+        self.lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        with self._connect() as conn:
+            # WAL 모드: 여러 프로세스/세션이 동시에 읽어도 쓰기와 충돌하지 않음
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metadata (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        # 스레드마다 커넥션을 새로 여는 편이 sqlite3에서는 가장 안전함
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn: # 블록이 끝나면 commit (예외 시 rollback)
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, namespace: str, key: str):
+        """
+        (value, 경과 시간(초)) 튜플을 반환. 없으면 None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, fetched_at FROM metadata WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return json.loads(row[0]), time.time() - row[1]
+
+    def set(self, namespace: str, key: str, value):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO metadata (namespace, key, value, fetched_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+
+    def invalidate(self, namespace: str, key: str = None):
+        with self._connect() as conn:
+            if key is None:
+                conn.execute("DELETE FROM metadata WHERE namespace = ?", (namespace,))
+            else:
+                conn.execute("DELETE FROM metadata WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def get_or_fetch(self, namespace: str, key: str, fetch_fn, ttl: float, stale_ttl: float = 0, force: bool = False):
+        """
+        캐시에서 값을 찾고, 없거나 너무 오래되었으면 fetch_fn()으로 가져와 저장
+        fetch_fn이 예외를 던지면 (오래된 캐시값도 없을 때) 그대로 전파됨
+        force면 캐시를 무시하고 동기적으로 다시 가져옴 (사용자가 직접 새로고침한 경우)
+        """
+        cached = self.get(namespace, key)
+
+        if force:
+            try:
+                value = fetch_fn()
+            except Exception as e:
+                # 레이트 리밋 등으로 실패하면 캐시값이라도 보여줌
+                if cached is None:
+                    raise
+                if self.logger: self.logger.error(f"새로고침 실패, 캐시값 사용 {namespace}/{key}: {e}")
+                return cached[0]
+            self.set(namespace, key, value)
+            return value
+
+        if cached is not None:
+            value, age = cached
+            if age < ttl:
+                return value
+            if age < ttl + stale_ttl:
+                self._refresh_in_background(namespace, key, fetch_fn)
+                return value
+
+        value = fetch_fn()
+        self.set(namespace, key, value)
+        return value
+
+    def _refresh_in_background(self, namespace: str, key: str, fetch_fn):
+        with self.lock:
+            if (namespace, key) in self.refreshing:
+                return
+            self.refreshing.add((namespace, key))
+
+        def worker():
+            try:
+                self.set(namespace, key, fetch_fn())
+                if self.logger: self.logger.debug(f"🔄 캐시 갱신 완료: {namespace}/{key}")
+            except Exception as e:
+                # 갱신에 실패해도 기존 캐시값은 그대로 유지
+                if self.logger: self.logger.error(f"캐시 갱신 실패 {namespace}/{key}: {e}")
+            finally:
+                with self.lock:
+                    self.refreshing.discard((namespace, key))
+
+        threading.Thread(target=worker, daemon=True).start()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+def _pushed_after(repo: dict, cutoff: datetime) -> bool:
+    if not repo.get("pushed_at"):
+        return False
+    pushed_at = datetime.fromisoformat(repo["pushed_at"])
+    # PyGithub 버전에 따라 timezone 정보가 없을 수 있음 (UTC로 간주)
+    if pushed_at.tzinfo is None:
+        pushed_at = pushed_at.replace(tzinfo=timezone.utc)
+    return pushed_at >= cutoff
+
+def filter_repos(repos: list, query: str = "", languages: list = None, pushed_within_days: int = None,
+                 max_size_kb: int = None, include_forks: bool = True, include_archived: bool = True) -> list:
+    """
+    레포 메타데이터(딕셔너리) 리스트를 검색어/언어/최근 푸시/크기/포크/보관 여부로 필터링
+    """
+    query = query.strip().lower()
+    languages = set(languages) if languages else None
+    cutoff = datetime.now(timezone.utc) - timedelta(days=pushed_within_days) if pushed_within_days else None
+
+    result = []
+    for repo in repos:
+        if query and query not in repo["name"].lower():
+            continue
+        if languages is not None and (repo.get("language") or "Unknown") not in languages:
+            continue
+        if not include_forks and repo.get("fork"):
+            continue
+        if not include_archived and repo.get("archived"):
+            continue
+        if max_size_kb is not None and (repo.get("size") or 0) > max_size_kb:
+            continue
+        if cutoff is not None and not _pushed_after(repo, cutoff):
+            continue
+        result.append(repo)
+    return result
+
+def get_languages(repos: list) -> list:
+    """필터 선택지로 쓸 언어 목록 (언어 정보가 없으면 'Unknown')"""
+    return sorted({repo.get("language") or "Unknown" for repo in repos})
+
+def paginate(items: list, page: int, page_size: int):
+    """
+    (현재 페이지 항목, 전체 페이지 수, 보정된 페이지 번호) 반환. 페이지 번호는 1부터 시작
+    """
+    page_count = max(1, math.ceil(len(items) / page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return items[start:start + page_size], page_count, page
\ No newline at end of file
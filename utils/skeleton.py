@@ -0,0 +1,274 @@
+import os
+import re
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+
+# 스켈레톤 대신 전체 내용을 그대로 넣을 핵심 파일 (진입점, 의존성/빌드 설정)
+KEY_FILE_NAMES = {
+    'readme.md', 'requirements.txt', 'pyproject.toml', 'setup.py', 'setup.cfg', 'pipfile',
+    'package.json', 'tsconfig.json', 'cargo.toml', 'go.mod', 'pom.xml', 'build.gradle',
+    'settings.gradle', 'cmakelists.txt', 'makefile', 'dockerfile', 'docker-compose.yml',
+    'main.py', 'app.py', '__main__.py', 'cli.py', 'manage.py',
+    'index.js', 'main.js', 'index.ts', 'main.ts', 'main.c', 'main.cpp', 'program.cs'
+}
+
+# 언어별 처리 방식
+PYTHON_EXTENSIONS = {'.py'}
+BRACE_EXTENSIONS = {'.java', '.c', '.cpp', '.h', '.hpp', '.cs', '.js', '.ts', '.jsx', '.tsx'}
+STYLE_EXTENSIONS = {'.css', '.scss', '.less'}
+LUA_EXTENSIONS = {'.lua'}
+HEAD_ONLY_EXTENSIONS = {'.html', '.sql'}
+
+# 핵심 파일이 아닌데 너무 긴 파일(lock 파일, 데이터 JSON 등)은 앞부분만 남김
+MAX_FULL_LINES = 300
+HEAD_ONLY_LINES = 60
+# 한 줄짜리 상수 등은 이 길이 이하일 때만 스켈레톤에 남김
+MAX_ASSIGN_LENGTH = 120
+
+# 파일 해시 -> 스켈레톤 결과 캐시 (LRU)
+SKELETON_CACHE_SIZE = 4096
+# 캐시 미스가 이만큼 이상일 때만 프로세스 풀을 사용 (작은 레포는 프로세스 간 전송 비용이 더 큼)
+POOL_THRESHOLD = 32
+# 프로세스 풀 워커 수 (Streamlit 서버와 CPU를 나눠 써야 하므로 제한)
+POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_skeleton_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# 프로세스 풀은 처음 필요할 때 한 번만 만들고 레포/세션 간에 공유
+_pool = None
+_pool_lock = threading.Lock()
+
+# 함수 본문으로 보이는 블록의 헤더: "...)" 또는 "...) : 반환타입", "...) throws X", "... =>"
+FUNCTION_HEADER = re.compile(
+    r"(\)\s*(const|noexcept|override|final|mutable|\s)*(throws\s+[\w.,\s]+)?(->\s*[^{;]+|:\s*[^{;()]+)?|=>)\s*$"
+)
+CONTAINER_KEYWORDS = re.compile(r"\b(class|struct|interface|namespace|enum|record|object|module|extern)\b")
+LUA_FUNCTION = re.compile(r"^\s*(local\s+)?function\b|^\s*[\w.:]+\s*=\s*function\b")
+
+def is_key_file(rel_path: str) -> bool:
+    return os.path.basename(rel_path).lower() in KEY_FILE_NAMES
+
+def needs_skeleton(rel_path: str) -> bool:
+    """
+    스켈레톤으로 줄일 대상인지 (핵심 파일은 항상 전체 내용 유지)
+    """
+    return not is_key_file(rel_path)
+
+def _truncate_lines(content: str, max_lines: int) -> str:
+    lines = content.splitlines()
+    if len(lines) <= max_lines:
+        return content
+    return "\n".join(lines[:max_lines]) + f"\n... ({len(lines) - max_lines} lines omitted)"
+
+def _short_unparse(node) -> str:
+    text = ast.unparse(node)
+    return text if len(text) <= MAX_ASSIGN_LENGTH and "\n" not in text else None
+
+def _python_body_skeleton(body: list, top_level: bool) -> list:
+    result = []
+    for i, node in enumerate(body):
+        # docstring은 그대로 유지
+        if i == 0 and isinstance(node, ast.Expr) and isinstance(getattr(node, "value", None), ast.Constant) and isinstance(node.value.value, str):
+            result.append(node)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            result.append(node)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            docstring = ast.get_docstring(node, clean=False)
+            node.body = ([ast.Expr(ast.Constant(docstring))] if docstring else []) + [ast.Expr(ast.Constant(...))]
+            result.append(node)
+        elif isinstance(node, ast.ClassDef):
+            node.body = _python_body_skeleton(node.body, top_level=False) or [ast.Expr(ast.Constant(...))]
+            result.append(node)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)) and _short_unparse(node):
+            # 상수, 설정값, 필드 선언 등
+            result.append(node)
+        elif top_level and isinstance(node, ast.If) and "__name__" in ast.unparse(node.test):
+            # CLI 진입점은 전체 유지
+            result.append(node)
+    return result
+
+def python_skeleton(content: str) -> str:
+    """
+    ast로 파싱해서 import, 시그니처, docstring, 짧은 상수, __main__ 블록만 남김
+    """
+    tree = ast.parse(content)
+    tree.body = _python_body_skeleton(tree.body, top_level=True)
+    return ast.unparse(tree)
+
+def brace_skeleton(content: str, collapse_all: bool = False) -> str:
+    """
+    C 계열/JS/TS 소스를 토크나이저 수준으로 훑으면서 함수 본문 블록을 '{ ... }'로 접음
+    문자열과 주석 안의 중괄호는 무시함. collapse_all이면 모든 최상위 블록을 접음 (CSS 등)
+    """
+    out = []
+    header = []      # 현재 문장(헤더) 누적 버퍼
+    skip_depth = 0   # 0이 아니면 접힌 블록 내부를 건너뛰는 중
+    i = 0
+    n = len(content)
+
+    def emit(text):
+        if skip_depth == 0:
+            out.append(text)
+            header.append(text)
+
+    while i < n:
+        ch = content[i]
+        nxt = content[i + 1] if i + 1 < n else ""
+
+        # 주석
+        if ch == "/" and nxt == "/":
+            end = content.find("\n", i)
+            end = n if end == -1 else end
+            if skip_depth == 0:
+                out.append(content[i:end])
+            i = end
+            continue
+        if ch == "/" and nxt == "*":
+            end = content.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+            if skip_depth == 0:
+                out.append(content[i:end])
+            i = end
+            continue
+
+        # 문자열 리터럴
+        if ch in "\"'`":
+            j = i + 1
+            while j < n and content[j] != ch:
+                if content[j] == "\\":
+                    j += 1
+                elif content[j] == "\n" and ch != "`":
+                    break # 닫히지 않은 따옴표(예: C의 문자 리터럴 오류)는 줄 끝에서 끊음
+                j += 1
+            emit(content[i:j + 1])
+            i = j + 1
+            continue
+
+        if ch == "{":
+            if skip_depth:
+                skip_depth += 1
+            else:
+                head = "".join(header).strip()
+                is_function = FUNCTION_HEADER.search(head) and not CONTAINER_KEYWORDS.search(head.split("(")[0])
+                if collapse_all or is_function:
+                    out.append("{ ... }")
+                    skip_depth = 1
+                else:
+                    out.append(ch)
+                header.clear()
+        elif ch == "}":
+            if skip_depth:
+                skip_depth -= 1
+            else:
+                out.append(ch)
+            header.clear()
+        elif ch == ";":
+            emit(ch)
+            header.clear()
+        else:
+            emit(ch)
+        i += 1
+
+    # 접힌 블록 때문에 생긴 빈 줄 정리
+    text = "".join(out)
+    return re.sub(r"\n\s*\n(\s*\n)+", "\n\n", text).strip() + "\n"
+
+def lua_skeleton(content: str) -> str:
+    """
+    Lua는 function 선언줄, require, 주석만 남김
+    """
+    kept = []
+    for line in content.splitlines():
+        stripped = line.strip()
+        if LUA_FUNCTION.match(line) or stripped.startswith("--") or "require" in stripped:
+            kept.append(line)
+    return "\n".join(kept)
+
+def skeletonize(content: str, ext: str) -> str:
+    """
+    확장자에 맞는 방식으로 스켈레톤을 만듦. 파싱에 실패하면 앞부분만 잘라서 반환
+    """
+    try:
+        if ext in PYTHON_EXTENSIONS:
+            return python_skeleton(content)
+        if ext in BRACE_EXTENSIONS:
+            return brace_skeleton(content)
+        if ext in STYLE_EXTENSIONS:
+            return brace_skeleton(content, collapse_all=True)
+        if ext in LUA_EXTENSIONS:
+            return lua_skeleton(content)
+        if ext in HEAD_ONLY_EXTENSIONS:
+            return _truncate_lines(content, HEAD_ONLY_LINES)
+    except (SyntaxError, ValueError, RecursionError):
+        return _truncate_lines(content, HEAD_ONLY_LINES)
+
+    # 설정/문서 파일 등은 전체 유지 (너무 길면 자름)
+    return _truncate_lines(content, MAX_FULL_LINES)
+
+def _skeletonize_job(job):
+    # 프로세스 풀에서 실행되는 작업 (pickle 가능하도록 모듈 최상위 함수로 둠)
+    content, ext = job
+    return skeletonize(content, ext)
+
+def _cache_key(content: str, ext: str) -> str:
+    return ext + ":" + hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # multiprocessing은 import 비용이 있어서 풀이 필요할 때만 로딩
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # 멀티스레드 프로세스(Streamlit 서버 스레드, 캐시 갱신 스레드)에서 fork하면 데드락 위험이 있어 spawn 사용
+            _pool = ProcessPoolExecutor(max_workers=POOL_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _reset_pool():
+    # 워커가 죽어서 풀이 망가진 경우 다음 호출에서 새로 만들도록 버림
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+def skeletonize_many(jobs: list, logger=None) -> list:
+    """
+    [(content, ext), ...]를 받아 스켈레톤 리스트를 반환
+    파일 해시 기준으로 캐시하고, 캐시 미스가 많으면 프로세스 풀로 병렬 처리
+    """
+    keys = [_cache_key(content, ext) for content, ext in jobs]
+    results = [None] * len(jobs)
+    misses = []
+
+    with _cache_lock:
+        for idx, key in enumerate(keys):
+            if key in _skeleton_cache:
+                _skeleton_cache.move_to_end(key)
+                results[idx] = _skeleton_cache[key]
+            else:
+                misses.append(idx)
+
+    computed = None
+    if len(misses) >= POOL_THRESHOLD:
+        try:
+            computed = list(_get_pool().map(_skeletonize_job, [jobs[idx] for idx in misses], chunksize=8))
+        except Exception as e:
+            # 프로세스 생성 실패 등은 그냥 현재 프로세스에서 처리
+            if logger: logger.error(f"스켈레톤 프로세스 풀 실패, 순차 처리로 전환: {e}")
+            _reset_pool()
+    if computed is None:
+        computed = [_skeletonize_job(jobs[idx]) for idx in misses]
+
+    with _cache_lock:
+        for idx, skeleton in zip(misses, computed):
+            results[idx] = skeleton
+            _skeleton_cache[keys[idx]] = skeleton
+        while len(_skeleton_cache) > SKELETON_CACHE_SIZE:
+            _skeleton_cache.popitem(last=False)
+
+    if logger: logger.debug(f"🦴 스켈레톤 {len(jobs)}개 (캐시 적중 {len(jobs) - len(misses)}개)")
+    return results
\ No newline at end of file
@@ -0,0 +1,302 @@
+import os
+import time
+import asyncio
+import uuid
+import hashlib
+import shutil
+import logging
+from contextlib import asynccontextmanager
+
+try:
+    import fcntl # POSIX 전용 (Windows에서는 잠금 파일의 수정 시간으로 대체)
+except ImportError:
+    fcntl = None
+
+# 기본 용량 제한: 작업 폴더 전체가 이 크기를 넘으면 오래된 실행 결과부터 삭제
+DEFAULT_QUOTA_BYTES = 5 * 1024 ** 3
+# 디스크 여유 공간이 이보다 적으면 용량 제한 이하라도 추가로 삭제
+DEFAULT_MIN_FREE_BYTES = 1 * 1024 ** 3
+# tmpfs(/dev/shm)는 메모리를 쓰므로 여유 공간이 용량 제한의 이 배수 이상일 때만 사용
+TMPFS_HEADROOM = 2
+TMPFS_PATH = "/dev/shm"
+# fcntl이 없는 환경에서 잠금 파일이 이 시간 이내에 갱신되었으면 사용 중으로 간주
+LOCK_STALE_SECONDS = 6 * 3600
+# 새 실행 폴더를 만들 때 전역 잠금(다른 세션의 정리 작업)을 기다리는 최대 시간과 재시도 간격 (초)
+GLOBAL_LOCK_TIMEOUT = 60.0
+LOCK_RETRY_INTERVAL = 0.1
+
+# 패키징된 마크다운 컨텍스트 캐시 크기 상한 (HEAD SHA가 같은 레포는 다시 다운로드하지 않음)
+DEFAULT_CONTEXT_CACHE_BYTES = 512 * 1024 ** 2
+
+RUNS_DIR_NAME = "runs"
+CONTEXTS_DIR_NAME = "contexts"
+LOCK_FILE = ".lock"
+LAST_USED_FILE = ".last_used"  # 정상 종료된 실행에만 생김 (LRU 기준 시간)
+SIZE_FILE = ".size"            # 종료 시 계산해둔 폴더 크기 (매번 폴더를 다시 훑지 않기 위함)
+
+def get_dir_size(path):
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            try:
+                total += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                pass
+    return total
+
+def _make_private_dir(path):
+    """
+    현재 사용자만 접근할 수 있는(0700) 폴더를 만들고, 그렇게 쓸 수 있는지 확인
+    다른 사용자가 미리 만들어 둔 폴더나 심볼릭 링크면 False (프라이빗 레포 소스가 노출되지 않도록)
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        if os.path.islink(path):
+            return False
+        if hasattr(os, "getuid") and os.lstat(path).st_uid != os.getuid():
+            return False
+        os.chmod(path, 0o700)
+    except OSError:
+        return False
+    return True
+
+def _try_lock(lock_path):
+    """
+    잠금을 잡으면 파일 객체를, 다른 세션이 사용 중이면 None을 반환
+    """
+    lock_file = open(lock_path, "a+")
+    if fcntl is None:
+        os.utime(lock_path)
+        return lock_file
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return lock_file
+    except OSError:
+        lock_file.close()
+        return None
+
+def _acquire_lock(lock_path, timeout):
+    """
+    잠금이 풀릴 때까지 짧은 간격으로 재시도하고, timeout 안에 못 잡으면 TimeoutError
+    (무한정 기다리는 blocking flock 대신 사용)
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        lock_file = _try_lock(lock_path)
+        if lock_file is not None:
+            return lock_file
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"작업 폴더 잠금을 {timeout:g}초 안에 얻지 못했습니다: {lock_path}")
+        time.sleep(LOCK_RETRY_INTERVAL)
+
+def _release_lock(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    lock_file.close()
+
+def _is_in_use(run_dir):
+    lock_path = os.path.join(run_dir, LOCK_FILE)
+    if not os.path.exists(lock_path):
+        return False
+    if fcntl is None:
+        return time.time() - os.path.getmtime(lock_path) < LOCK_STALE_SECONDS
+    lock_file = _try_lock(lock_path)
+    if lock_file is None:
+        return True
+    _release_lock(lock_file)
+    return False
+
+class WorkspaceManager:
+    """
+    다운로드/압축 해제/마크다운 컨텍스트가 저장되는 작업 폴더 관리자
+
+    - 실행(run)마다 별도의 스크래치 폴더를 만들어 여러 세션이 동시에 써도 서로 덮어쓰지 않음
+    - 작업 폴더는 현재 사용자만 접근 가능(0700)
+    - (선택) tmpfs(/dev/shm)를 사용. 용량 제한만큼 메모리를 쓸 수 있어서 기본은 꺼져 있음
+    - 전체 용량 제한(quota)과 디스크 여유 공간을 기준으로 오래된 실행 폴더부터 삭제 (LRU)
+    - 실행이 실패하면 그 실행의 부분 다운로드/압축 해제 결과를 바로 삭제
+    - 패키징 결과(마크다운 컨텍스트)를 키(레포@HEAD SHA + 옵션)별로 보관해서 변경 없는 레포는 재다운로드를 건너뜀
+    """
+    def __init__(self, base_dir, quota_bytes=DEFAULT_QUOTA_BYTES, min_free_bytes=DEFAULT_MIN_FREE_BYTES,
+                 prefer_tmpfs=False, context_cache_bytes=DEFAULT_CONTEXT_CACHE_BYTES, logger: logging.Logger = None):
+        self.quota_bytes = quota_bytes
+        self.context_cache_bytes = context_cache_bytes
+        self.min_free_bytes = min_free_bytes
+        self.logger = logger
+
+        root = base_dir
+        if prefer_tmpfs and self._tmpfs_available():
+            # /dev/shm은 모든 사용자가 쓰는 공간이라 사용자별 폴더를 만들고 소유자를 확인
+            tmpfs_root = os.path.join(TMPFS_PATH, f"readme-generator-{os.getuid()}")
+            if _make_private_dir(tmpfs_root):
+                root = tmpfs_root
+            elif self.logger:
+                self.logger.error(f"tmpfs 작업 폴더를 안전하게 만들 수 없어 디스크를 사용합니다: {tmpfs_root}")
+
+        self.runs_dir = os.path.join(root, RUNS_DIR_NAME)
+        os.makedirs(root, exist_ok=True)
+        if not _make_private_dir(self.runs_dir):
+            raise PermissionError(f"작업 폴더가 다른 사용자 소유이거나 심볼릭 링크입니다: {self.runs_dir}")
+        self.contexts_dir = os.path.join(root, CONTEXTS_DIR_NAME)
+        if not _make_private_dir(self.contexts_dir):
+            raise PermissionError(f"작업 폴더가 다른 사용자 소유이거나 심볼릭 링크입니다: {self.contexts_dir}")
+        # 정리(enforce_quota)와 새 실행 폴더 생성을 직렬화하는 전역 잠금
+        self.global_lock_path = os.path.join(self.runs_dir, LOCK_FILE)
+
+        if self.logger: self.logger.debug(f"🗂️ 작업 폴더: {self.runs_dir}")
+
+    def _tmpfs_available(self):
+        if not os.path.isdir(TMPFS_PATH) or not os.access(TMPFS_PATH, os.W_OK):
+            return False
+        return shutil.disk_usage(TMPFS_PATH).free >= self.quota_bytes * TMPFS_HEADROOM
+
+    def _start_run(self, user_name):
+        # 새 실행을 시작하기 전에 공간부터 확보
+        self.enforce_quota()
+
+        run_dir = os.path.join(self.runs_dir, f"{user_name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}")
+        # 폴더 생성과 잠금을 전역 잠금 안에서 처리
+        # (그 사이에 다른 세션의 enforce_quota가 잠금 없는 새 폴더를 비정상 종료된 실행으로 보고 지우지 않도록)
+        global_lock = _acquire_lock(self.global_lock_path, GLOBAL_LOCK_TIMEOUT)
+        try:
+            os.makedirs(run_dir)
+            lock_file = _try_lock(os.path.join(run_dir, LOCK_FILE))
+        finally:
+            _release_lock(global_lock)
+        return run_dir, lock_file
+
+    def _abort_run(self, run_dir, lock_file):
+        # 실패한 실행의 부분 다운로드/압축 해제 결과는 남기지 않음
+        if self.logger: self.logger.error(f"실행 실패, 작업 폴더 삭제: {run_dir}")
+        _release_lock(lock_file)
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    def _finish_run(self, run_dir, lock_file):
+        # 정상 종료: 크기와 마지막 사용 시간을 기록해두고 잠금 해제
+        with open(os.path.join(run_dir, SIZE_FILE), "w") as f:
+            f.write(str(get_dir_size(run_dir)))
+        with open(os.path.join(run_dir, LAST_USED_FILE), "w") as f:
+            f.write(str(time.time()))
+        _release_lock(lock_file)
+
+        self.enforce_quota()
+
+    @asynccontextmanager
+    async def run(self, user_name):
+        """
+        실행 하나의 스크래치 폴더를 만들어 경로를 넘겨줌 (async with로 사용)
+        with 블록 동안은 잠금을 잡고 있어 다른 세션의 정리 대상에서 제외됨
+        잠금 대기, 정리(rmtree), 폴더 크기 계산은 별도 스레드에서 실행해서 이벤트 루프를 막지 않음
+        """
+        run_dir, lock_file = await asyncio.to_thread(self._start_run, user_name)
+        try:
+            yield run_dir
+        except BaseException:
+            await asyncio.to_thread(self._abort_run, run_dir, lock_file)
+            raise
+        await asyncio.to_thread(self._finish_run, run_dir, lock_file)
+
+    def _context_path(self, key):
+        return os.path.join(self.contexts_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".md")
+
+    def load_context(self, key):
+        """
+        저장해둔 마크다운 컨텍스트를 반환 (없으면 None)
+        """
+        path = self._context_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            os.utime(path) # LRU 기준 시간 갱신
+            return content
+        except OSError:
+            return None
+
+    def store_context(self, key, content):
+        """
+        마크다운 컨텍스트를 저장하고, 캐시 크기 상한을 넘으면 오래 안 쓴 것부터 삭제
+        """
+        path = self._context_path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        # 다른 세션이 읽는 중에도 반쯤 쓰인 파일이 보이지 않도록 원자적으로 교체
+        os.replace(tmp_path, path)
+
+        entries = []
+        for entry in os.scandir(self.contexts_dir):
+            if entry.name.endswith(".tmp"):
+                continue # 다른 세션이 쓰는 중인 파일
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total <= self.context_cache_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            total -= size
+
+    def _list_runs(self):
+        """
+        [(마지막 사용 시간, 크기, 경로, 정상 종료 여부), ...]
+        """
+        runs = []
+        for entry in os.scandir(self.runs_dir):
+            if not entry.is_dir():
+                continue
+            last_used_path = os.path.join(entry.path, LAST_USED_FILE)
+            size_path = os.path.join(entry.path, SIZE_FILE)
+            completed = os.path.exists(last_used_path)
+
+            try:
+                last_used = os.path.getmtime(last_used_path if completed else entry.path)
+                if os.path.exists(size_path):
+                    with open(size_path) as f:
+                        size = int(f.read().strip() or 0)
+                else:
+                    size = get_dir_size(entry.path)
+            except (OSError, ValueError):
+                continue # 다른 세션이 방금 지운 경우 등
+            runs.append((last_used, size, entry.path, completed))
+        return runs
+
+    def enforce_quota(self):
+        """
+        용량 제한/디스크 여유 공간을 맞출 때까지 사용 중이 아닌 실행 폴더를 오래된 순으로 삭제
+        중간에 비정상 종료되어 남은 실행 폴더는 가장 먼저 정리
+        """
+        # 여러 세션이 동시에 정리하지 않도록 전역 잠금
+        evict_lock = _try_lock(self.global_lock_path)
+        if evict_lock is None:
+            return
+
+        try:
+            runs = self._list_runs()
+            total = sum(size for _, size, _, _ in runs)
+            # 비정상 종료된 실행 먼저, 그다음 오래된 순
+            runs.sort(key=lambda r: (r[3], r[0]))
+
+            evicted = 0
+            for last_used, size, path, completed in runs:
+                over_quota = total > self.quota_bytes
+                low_disk = shutil.disk_usage(self.runs_dir).free < self.min_free_bytes
+                if completed and not over_quota and not low_disk:
+                    break
+                if _is_in_use(path):
+                    continue
+
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                evicted += 1
+
+            if evicted and self.logger:
+                self.logger.debug(f"🧹 오래된 작업 폴더 {evicted}개 삭제 (현재 {total / 1024 ** 2:.1f}MB)")
+        finally:
+            _release_lock(evict_lock)
\ No newline at end of file